@@ -0,0 +1,138 @@
+"""Precomputed action id -> class index, so resolving an action is a single import.
+
+feaas' build_action_class() probes each search path in turn by import, so an id that
+lives on a late path (or nowhere) pays a failed import per earlier path. The index is
+generated from the same crawl REGISTER_ACTIONS publishes (`python -m src.catalog`, run
+by the Docker build) and maps every worker action id straight to its module and class.
+Ids it doesn't cover - plus-engine and plus-core actions - fall back to probing the
+other search paths; the worker's own path is skipped since the index already covers it.
+That only holds while the index matches src/actions, so an index whose sources_hash is
+out of date is ignored and every search path is probed, as if there were no index.
+
+The Docker build also stamps the hash of the sources it copied into the image
+(`python -m src.catalog --stamp`, see STAMP_PATH), so a worker compares the index against
+that instead of re-reading every action module on each cold start. A checkout without
+a stamp hashes src/actions itself.
+"""
+import hashlib
+import importlib
+import json
+import os
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+INDEX_PATH = os.path.join(SRC_DIR, 'action_index.json')
+# sources_hash() of the image's src/actions, written at build time
+STAMP_PATH = os.path.join(SRC_DIR, 'sources_hash')
+# The search path the crawl of src/actions covers
+LOCAL_SEARCH_PATH = 'src.actions.vendor'
+
+_index = None
+
+
+def sources_hash(root: str = os.path.join(SRC_DIR, 'actions')) -> str:
+    """SHA-256 over the path and contents of every .py file under `root`."""
+    digest = hashlib.sha256()
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d != '__pycache__')
+        for name in sorted(filenames):
+            if name.endswith('.py'):
+                path = os.path.join(dirpath, name)
+                digest.update(os.path.relpath(path, root).encode('utf-8') + b'\0')
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+    return digest.hexdigest()
+
+
+def current_sources_hash() -> str:
+    """The hash stamped at STAMP_PATH by the image build, or sources_hash() without one."""
+    try:
+        with open(STAMP_PATH) as f:
+            stamped = f.read().strip()
+    except OSError:
+        stamped = ''
+    return stamped or sources_hash()
+
+
+def write_stamp(path: str = STAMP_PATH):
+    with open(path, 'w') as f:
+        f.write(sources_hash() + '\n')
+
+
+def build_index(action_mapping: dict) -> dict:
+    """Index for a crawler's {action_id: class} mapping."""
+    return {
+        'sources_hash': sources_hash(),
+        'actions': {action_id: {'module': cls.__module__, 'class': cls.__name__}
+                    for action_id, cls in sorted(action_mapping.items())},
+    }
+
+
+def write_index(index: dict, path: str = INDEX_PATH):
+    with open(path, 'w') as f:
+        json.dump(index, f, sort_keys=True, indent=1)
+
+
+def load_index(path: str = INDEX_PATH) -> dict:
+    """The generated index, loaded once per process. {} if the image has none or it's stale."""
+    global _index
+    if _index is None:
+        try:
+            with open(path) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+        if index and index.get('sources_hash') != current_sources_hash():
+            print(f"  WARNING: {path} is out of date with src/actions; resolving by search path")
+            index = {}
+        _index = index
+    return _index
+
+
+def resolve(action_id: str, search_paths: list):
+    """The class for `action_id`: via the index if it has it, else by probing search_paths.
+
+    Raises ModuleNotFoundError if it can't be found, as build_action_class does.
+    """
+    index = load_index()
+    entry = index.get('actions', {}).get(action_id)
+    if entry:
+        return getattr(importlib.import_module(entry['module']), entry['class'])
+
+    from feaas.util.common import build_action_class
+    if index:
+        search_paths = [p for p in search_paths if p != LOCAL_SEARCH_PATH]
+    return build_action_class(action_id, search_paths=search_paths)
+
+
+def check(index: dict, action_mapping: dict, search_paths: list) -> list:
+    """Ways `index` disagrees with a fresh crawl or with search-path probing. Empty if none.
+
+    An indexed id that doesn't import, or that probing can't resolve, is a problem too:
+    the worker would fail to run it (or run it only while the index is current).
+    """
+    from feaas.util.common import build_action_class
+
+    problems = []
+    if index.get('sources_hash') != sources_hash():
+        problems.append("src/actions changed since the index was generated")
+    indexed = index.get('actions', {})
+    for action_id in sorted(set(action_mapping) - set(indexed)):
+        problems.append(f"{action_id}: missing from the index")
+    for action_id in sorted(set(indexed) - set(action_mapping)):
+        problems.append(f"{action_id}: in the index but no longer crawled")
+    for action_id, entry in sorted(indexed.items()):
+        try:
+            getattr(importlib.import_module(entry['module']), entry['class'])
+        except Exception as e:
+            problems.append(f"{action_id}: index gives {entry['module']}.{entry['class']}, "
+                            f"which fails to import: {e!r}")
+            continue
+        try:
+            probed = build_action_class(action_id, search_paths=search_paths)
+        except Exception as e:
+            problems.append(f"{action_id}: probing the search paths fails: {e!r}")
+            continue
+        if (probed.__module__, probed.__name__) != (entry['module'], entry['class']):
+            problems.append(f"{action_id}: index gives {entry['module']}.{entry['class']} "
+                            f"but probing gives {probed.__module__}.{probed.__name__}")
+    return problems
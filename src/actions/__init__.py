@@ -1,2 +1,3 @@
 # plus-worker actions
-from src.actions.vendor.ffmpeg import *
+# Action modules are imported on demand (by id via src.action_index, or by the
+# crawler); `from src.actions.vendor.ffmpeg import Probe` still works.
@@ -0,0 +1,93 @@
+"""Process-wide Chromium for the web actions.
+
+Launching Chromium costs far more than loading a page, so BROWSER_POOL starts it on
+first use and keeps it for later calls. Each call gets a fresh browser context
+(separate cookies, storage and cache), so captures stay isolated from each other. The
+browser is relaunched after SCREENSHOT_RECYCLE_PAGES pages, to cap memory growth, and
+whenever it has crashed or disconnected.
+
+Playwright's sync API objects belong to the thread that created them, so the pool keeps
+one browser per thread. The worker runs actions on its main thread, so in practice
+there is one.
+"""
+import atexit
+import os
+import threading
+from contextlib import contextmanager
+
+RECYCLE_PAGES = int(os.environ.get('SCREENSHOT_RECYCLE_PAGES', 200))
+LAUNCH_ARGS = ['--no-sandbox', '--disable-gpu']
+
+
+class BrowserPool:
+    """Lazily launched, periodically recycled Chromium, one per thread."""
+
+    def __init__(self, recycle_pages: int = RECYCLE_PAGES):
+        self.recycle_pages = max(1, recycle_pages)
+        self._local = threading.local()
+        self._all = []
+        self._all_lock = threading.Lock()
+
+    def _browser(self):
+        local = self._local
+        browser = getattr(local, 'browser', None)
+        if browser is not None and browser.is_connected() and local.pages < self.recycle_pages:
+            return browser
+        self._close_local()
+
+        from playwright.sync_api import sync_playwright
+        local.playwright = sync_playwright().start()
+        local.browser = local.playwright.chromium.launch(args=LAUNCH_ARGS)
+        local.pages = 0
+        with self._all_lock:
+            self._all.append(local.__dict__)
+        return local.browser
+
+    def _close_local(self):
+        state = self._local.__dict__
+        with self._all_lock:
+            self._all = [s for s in self._all if s is not state]
+        _close(state)
+
+    @contextmanager
+    def context(self, **context_args):
+        """A new browser context on the pooled browser, closed afterwards.
+
+        If the call fails and the browser has gone away with it, the next call launches
+        a new one.
+        """
+        browser = self._browser()
+        context = browser.new_context(**context_args)
+        try:
+            yield context
+        finally:
+            self._local.pages += 1
+            try:
+                context.close()
+            except Exception:
+                pass
+            if not browser.is_connected():
+                self._close_local()
+
+    def shutdown(self):
+        """Close every browser the pool launched (from the threads that own them, ideally)."""
+        with self._all_lock:
+            states, self._all = self._all, []
+        for state in states:
+            _close(state)
+
+
+def _close(state: dict):
+    browser = state.pop('browser', None)
+    playwright = state.pop('playwright', None)
+    for close in (getattr(browser, 'close', None), getattr(playwright, 'stop', None)):
+        if close is None:
+            continue
+        try:
+            close()
+        except Exception:
+            pass
+
+
+BROWSER_POOL = BrowserPool()
+atexit.register(BROWSER_POOL.shutdown)
@@ -1,12 +1,35 @@
-"""Screenshot action - capture a URL as PNG via Playwright (chromium)."""
+"""Screenshot / BatchScreenshot actions - capture URLs as PNG via Playwright (chromium)."""
+import asyncio
+import json
 import os
 import re
+import tempfile
 import traceback
 import uuid
 from datetime import datetime, timezone
+from urllib.parse import urlsplit
 
 from feaas.abstract import AbstractAction
 import feaas.objects as objs
+from src.actions.web import screenshot_cache
+from src.progress import report as report_progress
+
+BATCH_PAGES = int(os.environ.get('SCREENSHOT_BATCH_PAGES', 8))
+BATCH_PER_HOST = int(os.environ.get('SCREENSHOT_BATCH_PER_HOST', 2))
+
+
+def normalize_url(url: str) -> str:
+    if re.match(r'^http[:|/]', url):
+        return 'https://' + url.rsplit('/', 1)[-1]
+    if not re.match(r'^https', url):
+        return 'https://' + url
+    return url
+
+
+def screenshot_key(dest_prefix: str, uid_len: int = 4) -> str:
+    dt = datetime.now(timezone.utc).strftime('%Y-%m-%d-at-%H-%M-%S')
+    uid = str(uuid.uuid4())[:uid_len]
+    return f'{dest_prefix}{dt}-{uid}.png'
 
 
 class Screenshot(AbstractAction):
@@ -29,6 +52,8 @@ class Screenshot(AbstractAction):
             objs.Parameter(var_name='dest_prefix', label='Destination',
                            sdefault='{hostname}/{username}/screenshots/',
                            ptype=objs.ParameterType.PREFIX),
+            objs.Parameter(var_name='max_age_sec', label='Reuse Captures Newer Than (s)',
+                           idefault=0, ptype=objs.ParameterType.INTEGER, optional=True),
         ]
         png_only = objs.Validation(vtype=objs.ValidationType.ENDS_WITH, svals=['.png'])
         outputs = [
@@ -37,39 +62,177 @@ class Screenshot(AbstractAction):
         ]
         super().__init__(params, outputs)
         self.blobstore = dao.get_blobstore() if dao else None
+        self.docstore = dao.get_docstore() if dao else None
 
-    def execute_action(self, url, width, height, dest_prefix) -> objs.Receipt:
-        if re.match(r'^http[:|/]', url):
-            url = 'https://' + url.rsplit('/', 1)[-1]
-        elif not re.match(r'^https', url):
-            url = 'https://' + url
+    def execute_action(self, url, width, height, dest_prefix, max_age_sec=0) -> objs.Receipt:
+        url = normalize_url(url)
 
         if not dest_prefix.endswith('/'):
             dest_prefix += '/'
-        dt = datetime.now(timezone.utc).strftime('%Y-%m-%d-at-%H-%M-%S')
-        uid = str(uuid.uuid4())[:4]
-        dest_key = f'{dest_prefix}{dt}-{uid}.png'
 
-        local_path = f'/tmp/screenshot_{uuid.uuid4()}.png'
+        # With max_age_sec, a recent capture of the same URL and viewport is reused
+        if max_age_sec and self.docstore:
+            cached_key = screenshot_cache.lookup(self.docstore, self.blobstore, dest_prefix, url,
+                                                 width, height, float(max_age_sec))
+            if cached_key:
+                print(f"  Reusing cached screenshot: {cached_key}")
+                outputs = {'dest_key': objs.AnyType(ptype=objs.ParameterType.KEY, sval=cached_key)}
+                return objs.Receipt(success=True, outputs=outputs, primary_output='dest_key')
+
+        dest_key = screenshot_key(dest_prefix)
+
         try:
-            from playwright.sync_api import sync_playwright
-            with sync_playwright() as p:
-                browser = p.chromium.launch(args=['--no-sandbox', '--disable-gpu'])
-                context = browser.new_context(viewport={'width': width, 'height': height})
+            from src.actions.web.browser_pool import BROWSER_POOL
+            with BROWSER_POOL.context(viewport={'width': width, 'height': height}) as context:
                 page = context.new_page()
                 page.goto(url, wait_until='networkidle', timeout=30000)
-                page.screenshot(path=local_path, full_page=False)
-                browser.close()
+                img = page.screenshot(full_page=False)
         except Exception:
             return objs.Receipt(success=False, error_message=traceback.format_exc())
 
-        try:
-            with open(local_path, 'rb') as f:
-                img = f.read()
-            self.blobstore.save_blob(dest_key, img, metadata={'url': url}, content_type='image/png')
-        finally:
-            if os.path.exists(local_path):
-                os.remove(local_path)
+        self.blobstore.save_blob(dest_key, img, metadata={'url': url}, content_type='image/png')
+        if self.docstore:
+            screenshot_cache.remember(self.docstore, dest_prefix, url, width, height, dest_key)
 
         outputs = {'dest_key': objs.AnyType(ptype=objs.ParameterType.KEY, sval=dest_key)}
         return objs.Receipt(success=True, outputs=outputs, primary_output='dest_key')
+
+
+class BatchScreenshot(AbstractAction):
+    """Capture many URLs concurrently with Playwright's async API.
+
+    URLs come from a list, or from the `url_field` of every item in a stream. One
+    Chromium drives up to max_pages pages at once, at most per_host of them against any
+    one host, each in its own browser context and bounded by timeout_sec. Uploads run
+    on threads while the next pages load. One receipt per URL is written as JSON Lines to
+    `screenshot_receipts.jsonl` under dest_prefix.
+    """
+
+    def __init__(self, dao):
+        v_w_min = objs.Validation(vtype=objs.ValidationType.GREATER_THAN, ival=50)
+        v_w_max = objs.Validation(vtype=objs.ValidationType.LESS_THAN, ival=1920)
+        v_h_min = objs.Validation(vtype=objs.ValidationType.GREATER_THAN, ival=50)
+        v_h_max = objs.Validation(vtype=objs.ValidationType.LESS_THAN, ival=1080)
+        params = [
+            objs.Parameter(var_name='urls', label='URLs', ptype=objs.ParameterType.LIST, optional=True),
+            objs.Parameter(var_name='stream_id', label='Stream of URLs', ptype=objs.ParameterType.STRING,
+                           optional=True),
+            objs.Parameter(var_name='url_field', label='URL Field', sdefault='url',
+                           ptype=objs.ParameterType.STRING, optional=True),
+            objs.Parameter(var_name='width', label='Width',
+                           idefault=1200, ptype=objs.ParameterType.INTEGER,
+                           validations=[v_w_min, v_w_max]),
+            objs.Parameter(var_name='height', label='Height',
+                           idefault=800, ptype=objs.ParameterType.INTEGER,
+                           validations=[v_h_min, v_h_max]),
+            objs.Parameter(var_name='dest_prefix', label='Destination',
+                           sdefault='{hostname}/{username}/screenshots/',
+                           ptype=objs.ParameterType.PREFIX),
+            objs.Parameter(var_name='max_pages', label='Pages at Once', idefault=BATCH_PAGES,
+                           ptype=objs.ParameterType.INTEGER, optional=True),
+            objs.Parameter(var_name='per_host', label='Pages per Host', idefault=BATCH_PER_HOST,
+                           ptype=objs.ParameterType.INTEGER, optional=True),
+            objs.Parameter(var_name='timeout_sec', label='Page Timeout (s)', ptype=objs.ParameterType.FLOAT,
+                           optional=True),
+        ]
+        outputs = [
+            objs.Parameter(var_name='files', label='Screenshots', ptype=objs.ParameterType.LIST),
+            objs.Parameter(var_name='receipts_key', label='Per-URL Receipts', ptype=objs.ParameterType.KEY),
+            objs.Parameter(var_name='captured', label='# Captured', ptype=objs.ParameterType.INTEGER),
+            objs.Parameter(var_name='failed', label='# Failed', ptype=objs.ParameterType.INTEGER),
+        ]
+        super().__init__(params, outputs)
+        self.dao = dao
+        self.blobstore = dao.get_blobstore() if dao else None
+
+    def execute_action(self, dest_prefix, width=1200, height=800, urls=None, stream_id=None, url_field='url',
+                       max_pages=None, per_host=None, timeout_sec=30.0) -> objs.Receipt:
+        if not dest_prefix.endswith('/'):
+            dest_prefix += '/'
+        try:
+            if stream_id:
+                items = self.dao.get_streams().read_stream(stream_id, after_timestamp=0, limit=10000)
+                urls = [item[url_field or 'url'] for item in items if item.get(url_field or 'url')]
+            urls = [normalize_url(u) for u in urls or []]
+            if not urls:
+                return objs.Receipt(success=False, error_message='No URLs to capture.')
+
+            receipts = asyncio.run(self._capture_all(
+                urls, dest_prefix, {'width': width, 'height': height},
+                max(1, int(max_pages or BATCH_PAGES)), max(1, int(per_host or BATCH_PER_HOST)),
+                float(timeout_sec or 30.0)))
+
+            fd, receipts_path = tempfile.mkstemp(suffix='.jsonl')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    for receipt in receipts:
+                        f.write(json.dumps(receipt) + '\n')
+                receipts_key = f'{dest_prefix}screenshot_receipts.jsonl'
+                self.blobstore.upload_file(receipts_path, receipts_key)
+            finally:
+                os.remove(receipts_path)
+
+            files = [r['dest_key'] for r in receipts if r['success']]
+            return objs.Receipt(
+                success=True, primary_output='files',
+                outputs={
+                    'files': objs.AnyType(ptype=objs.ParameterType.LIST, svals=files),
+                    'receipts_key': objs.AnyType(ptype=objs.ParameterType.KEY, sval=receipts_key),
+                    'captured': objs.AnyType(ptype=objs.ParameterType.INTEGER, ival=len(files)),
+                    'failed': objs.AnyType(ptype=objs.ParameterType.INTEGER, ival=len(receipts) - len(files)),
+                },
+            )
+        except Exception:
+            return objs.Receipt(success=False, error_message=traceback.format_exc())
+
+    async def _capture_all(self, urls, dest_prefix, viewport, max_pages, per_host, timeout_sec) -> list:
+        from playwright.async_api import async_playwright
+
+        pages = asyncio.Semaphore(max_pages)
+        hosts = {}
+        done = []
+
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(args=['--no-sandbox', '--disable-gpu'])
+            relaunch = asyncio.Lock()
+
+            async def capture(url):
+                nonlocal browser
+                receipt = {'url': url, 'success': False}
+                host = hosts.setdefault(urlsplit(url).hostname or '', asyncio.Semaphore(per_host))
+                try:
+                    async with host, pages:
+                        async with relaunch:
+                            if not browser.is_connected():
+                                browser = await p.chromium.launch(args=['--no-sandbox', '--disable-gpu'])
+                        context = await browser.new_context(viewport=viewport)
+                        try:
+                            img = await asyncio.wait_for(self._load(context, url, timeout_sec), timeout_sec)
+                        finally:
+                            try:
+                                await context.close()
+                            except Exception:
+                                pass
+                    # The page slot is free again while this uploads
+                    dest_key = screenshot_key(dest_prefix, uid_len=8)
+                    await asyncio.to_thread(self.blobstore.save_blob, dest_key, img,
+                                            metadata={'url': url}, content_type='image/png')
+                    receipt.update(success=True, dest_key=dest_key)
+                except asyncio.TimeoutError:
+                    receipt['error_message'] = f'Timed out after {timeout_sec}s'
+                except Exception as e:
+                    receipt['error_message'] = str(e)
+                done.append(url)
+                report_progress(len(done) / len(urls))
+                return receipt
+
+            try:
+                return await asyncio.gather(*(capture(url) for url in urls))
+            finally:
+                await browser.close()
+
+    @staticmethod
+    async def _load(context, url, timeout_sec) -> bytes:
+        page = await context.new_page()
+        await page.goto(url, wait_until='networkidle', timeout=timeout_sec * 1000)
+        return await page.screenshot(full_page=False)
@@ -0,0 +1,48 @@
+"""Recent-capture cache for Screenshot, kept in the docstore.
+
+One document per (destination folder, normalized URL, width, height) records the blob
+key and capture time of the latest screenshot. Entries are scoped to the destination
+folder, so a hit never hands back a key outside the folder the caller asked for.
+Documents are overwritten on each capture; stale ones are simply ignored.
+"""
+import hashlib
+import time
+
+CACHE_OWNER = 'sys.plusworker.screenshot-cache'
+
+
+def cache_id(dest_prefix: str, url: str, width: int, height: int) -> str:
+    digest = hashlib.sha1(f"{dest_prefix}\0{url}\0{int(width)}x{int(height)}".encode()).hexdigest()
+    return f"{CACHE_OWNER}.{digest}"
+
+
+def lookup(docstore, blobstore, dest_prefix: str, url: str, width: int, height: int, max_age: float) -> str:
+    """The dest_key of a capture younger than `max_age` seconds whose blob still exists, else None."""
+    try:
+        doc = docstore.get_document(cache_id(dest_prefix, url, width, height))
+    except Exception as e:
+        print(f"  Screenshot cache lookup failed: {e}")
+        return None
+    if not doc or time.time() - float(doc.get('captured_at', 0)) > max_age:
+        return None
+    dest_key = doc.get('dest_key')
+    if not dest_key or not blobstore.exists(dest_key):
+        return None
+    return dest_key
+
+
+def remember(docstore, dest_prefix: str, url: str, width: int, height: int, dest_key: str):
+    """Record a fresh capture. Failures are logged, never raised - the capture itself succeeded."""
+    object_id = cache_id(dest_prefix, url, width, height)
+    try:
+        docstore.save_document(object_id, {
+            'object_id': object_id,
+            'owner': CACHE_OWNER,
+            'url': url,
+            'width': int(width),
+            'height': int(height),
+            'dest_key': dest_key,
+            'captured_at': int(time.time()),
+        })
+    except Exception as e:
+        print(f"  Screenshot cache update failed: {e}")
@@ -0,0 +1,170 @@
+"""The plus-worker action catalog: crawl, serialize and hash every action.
+
+REGISTER_ACTIONS publishes this catalog (see worker.register_actions). Crawling imports
+and instantiates every action, so the Docker build runs
+
+    python -m src.catalog
+
+to bake the result into the image as CATALOG_PATH; at runtime registration loads that
+file instead of crawling. The same crawl produces the action index (src.action_index)
+the worker resolves action ids with, and the build fails if the index would resolve an
+id differently from search-path probing. `python -m src.catalog --check` reports whether
+an existing index is stale without writing anything; --stamp also stamps the sources
+hash into the image (action_index.STAMP_PATH), which the Docker build passes. Each action entry carries a content
+hash, and the catalog hash covers all of them, so registration can tell what (if
+anything) changed since the last publish.
+"""
+import hashlib
+import json
+import os
+import sys
+
+SYS_NAME = 'plus-worker'
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'actions_catalog.json')
+
+
+def content_hash(data) -> str:
+    """SHA-256 of `data` as canonical JSON (sorted keys, no whitespace)."""
+    canonical = json.dumps(data, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def crawl_action_classes() -> dict:
+    """Map action id -> action class for every action under src/actions."""
+    from plus_engine.acrawler import AvailableActionCrawler
+
+    crawler = AvailableActionCrawler(
+        sys_name=SYS_NAME,
+        dao=None,
+        module_prefix='src/actions',
+        owner='sys.action',
+        extra_sys_paths=['.']
+    )
+    return crawler.get_actions()
+
+
+def describe_action(action_id: str, action_class, strict: bool = False) -> dict:
+    """Catalog entry for one action: its params/outputs as JSON, plus its content hash.
+
+    An action that can't be instantiated gets a bare entry (no params/outputs), or with
+    `strict` its error is raised.
+    """
+    from google.protobuf.json_format import MessageToDict
+
+    class_path = f"{action_class.__module__}.{action_class.__name__}"
+    try:
+        action_instance = action_class(dao=None)
+        entry = {
+            'action_id': action_id,
+            'runtime': 'fargate',
+            'class_path': class_path,
+            'label': getattr(action_instance.action, 'label', '') or action_class.__name__,
+            'short_desc': getattr(action_instance.action, 'short_desc', ''),
+            'params': [MessageToDict(p, preserving_proto_field_name=True)
+                       for p in action_instance.action.params],
+            'outputs': [MessageToDict(o, preserving_proto_field_name=True)
+                        for o in action_instance.action.outputs],
+            'sys_name': SYS_NAME,
+        }
+        print(f"  {action_id}")
+    except Exception as e:
+        print(f"  {action_id} (error: {e})")
+        if strict:
+            raise
+        entry = {
+            'action_id': action_id,
+            'runtime': 'fargate',
+            'class_path': class_path,
+            'label': action_class.__name__,
+            'sys_name': SYS_NAME,
+        }
+    entry['content_hash'] = content_hash(entry)
+    return entry
+
+
+def build_catalog(action_mapping: dict = None, strict: bool = False) -> dict:
+    """Describe every action (crawling src/actions unless given the crawl). Returns {action_id: entry}.
+
+    Actions marked `internal` (rewrite targets such as FusedChain) are resolvable but not
+    published, so they're left out. With `strict`, raises RuntimeError naming every action that couldn't be described,
+    once all of them have been tried.
+    """
+    if action_mapping is None:
+        print("Crawling for actions in: src/actions")
+        action_mapping = crawl_action_classes()
+        print(f"Found {len(action_mapping)} actions")
+    actions_data, failed = {}, []
+    for action_id, action_class in sorted(action_mapping.items()):
+        if getattr(action_class, 'internal', False):
+            continue
+        try:
+            actions_data[action_id] = describe_action(action_id, action_class, strict)
+        except Exception as e:
+            failed.append(f"{action_id}: {e}")
+    if failed:
+        raise RuntimeError(f"{len(failed)} action(s) could not be described:\n  " + '\n  '.join(failed))
+    return actions_data
+
+
+def catalog_hash(actions_data: dict) -> str:
+    """Hash of the whole catalog, from the per-action hashes."""
+    return content_hash({action_id: entry.get('content_hash') or content_hash(entry)
+                         for action_id, entry in actions_data.items()})
+
+
+def load_catalog(path: str = CATALOG_PATH) -> dict:
+    """The catalog baked in at build time, or None if there isn't one."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_catalog(actions_data: dict, path: str = CATALOG_PATH):
+    with open(path, 'w') as f:
+        json.dump(actions_data, f, sort_keys=True, indent=1)
+
+
+def main():
+    """Build-time entry point: crawl once, write CATALOG_PATH and the action index, check the index.
+
+    With --check, only compare the existing index against a fresh crawl. With --stamp,
+    also write action_index.STAMP_PATH; only image builds should, since a stamp stops
+    the worker noticing later edits to src/actions.
+    """
+    from src import action_index
+    from src.worker import ACTION_SEARCH_PATHS
+
+    print("Crawling for actions in: src/actions")
+    action_mapping = crawl_action_classes()
+    print(f"Found {len(action_mapping)} actions")
+
+    if '--check' not in sys.argv[1:]:
+        try:
+            actions_data = build_catalog(action_mapping, strict=True)
+        except RuntimeError as e:
+            sys.exit(str(e))
+        write_catalog(actions_data)
+        print(f"Wrote {len(actions_data)} actions to {CATALOG_PATH} (catalog hash {catalog_hash(actions_data)[:12]})")
+        action_index.write_index(action_index.build_index(action_mapping))
+        print(f"Wrote action index to {action_index.INDEX_PATH}")
+        if '--stamp' in sys.argv[1:]:
+            action_index.write_stamp()
+            print(f"Stamped sources hash into {action_index.STAMP_PATH}")
+
+    try:
+        with open(action_index.INDEX_PATH) as f:
+            index = json.load(f)
+    except (OSError, ValueError) as e:
+        sys.exit(f"No usable action index at {action_index.INDEX_PATH}: {e}")
+    problems = action_index.check(index, action_mapping, ACTION_SEARCH_PATHS)
+    for problem in problems:
+        print(f"  STALE: {problem}", file=sys.stderr)
+    if problems:
+        sys.exit(1)
+    print("Action index is up to date")
+
+
+if __name__ == '__main__':
+    main()
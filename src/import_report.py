@@ -0,0 +1,100 @@
+"""Startup import-time reports for the worker, from `python -X importtime`.
+
+The worker imports each RUN_MODE's dependencies lazily (worker.MODE_IMPORTS). To see
+what a mode's cold start actually pays for, profile() runs those imports in a fresh
+interpreter under `-X importtime` and parses its stderr:
+
+    python -m src.import_report RUN_ACTION [--top 20]
+
+Set WORKER_IMPORT_REPORT=1 to have the worker log the same report at startup
+(it costs one extra interpreter, so it's off by default).
+"""
+import os
+import re
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOP_MODULES = int(os.environ.get('WORKER_IMPORT_REPORT_TOP', 15))
+
+# "import time: <self us> | <cumulative us> | <indent><module>"
+_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$')
+
+
+def parse_importtime(text: str) -> list:
+    """Entries of `-X importtime` output: dicts of module, self_us, cumulative_us, depth."""
+    entries = []
+    for line in text.splitlines():
+        m = _LINE.match(line)
+        if m:
+            entries.append({
+                'module': m.group(4),
+                'self_us': int(m.group(1)),
+                'cumulative_us': int(m.group(2)),
+                'depth': len(m.group(3)) // 2,
+            })
+    return entries
+
+
+def total_us(entries: list) -> int:
+    """Time spent importing, in microseconds: the sum over top-level imports."""
+    return sum(e['cumulative_us'] for e in entries if e['depth'] == 0)
+
+
+def profile(run_mode: str, action_id: str = None) -> dict:
+    """Import `run_mode`'s dependencies in a fresh interpreter under -X importtime.
+
+    Returns {'run_mode', 'wall_s', 'import_us', 'modules', 'entries'}. Raises
+    RuntimeError with the child's stderr if the imports fail.
+    """
+    code = f"import src.worker as w; w.load_mode_imports({run_mode!r}, {action_id!r})"
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    env.pop('PYTHONPROFILEIMPORTTIME', None)
+    started = time.monotonic()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            cwd=ROOT_DIR, env=env, capture_output=True, text=True)
+    wall_s = time.monotonic() - started
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {run_mode} dependencies failed:\n{result.stderr[-4000:]}")
+    entries = parse_importtime(result.stderr)
+    return {
+        'run_mode': run_mode,
+        'wall_s': wall_s,
+        'import_us': total_us(entries),
+        'modules': [e['module'] for e in entries],
+        'entries': entries,
+    }
+
+
+def format_report(report: dict, top: int = TOP_MODULES) -> str:
+    """Human-readable summary: totals plus the `top` slowest modules by cumulative time."""
+    lines = [f"Import report for {report['run_mode']}: {report['import_us'] / 1000:.0f} ms importing "
+             f"{len(report['modules'])} modules ({report['wall_s']:.2f}s wall incl. interpreter)"]
+    slowest = sorted(report['entries'], key=lambda e: e['cumulative_us'], reverse=True)[:top]
+    for e in slowest:
+        lines.append(f"  {e['cumulative_us'] / 1000:8.1f} ms  {e['self_us'] / 1000:7.1f} ms self  {e['module']}")
+    return '\n'.join(lines)
+
+
+def log_report(run_mode: str, action_id: str = None):
+    """Print the report for `run_mode`. Never raises - it's diagnostics only."""
+    try:
+        print(format_report(profile(run_mode, action_id)))
+    except Exception as e:
+        print(f"  WARNING: import report failed: {e}")
+
+
+def main():
+    args = sys.argv[1:]
+    top = TOP_MODULES
+    if '--top' in args:
+        i = args.index('--top')
+        top = int(args[i + 1])
+        del args[i:i + 2]
+    run_mode = args[0] if args else 'RUN_ACTION'
+    print(format_report(profile(run_mode, os.environ.get('ACTION_ID')), top))
+
+
+if __name__ == '__main__':
+    main()
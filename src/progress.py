@@ -0,0 +1,27 @@
+"""Process-wide progress reporting from long-running actions back to the job.
+
+Actions call report(fraction) as work advances. The worker installs a listener for the
+job it is running (see worker.py) that persists the percentage; without a listener,
+reports are dropped. A listener raises Cancelled to abort the action.
+"""
+_listener = None
+
+
+class Cancelled(BaseException):
+    """Raised from report() when the job was cancelled.
+
+    A BaseException, like KeyboardInterrupt, so the `except Exception` handlers that turn
+    errors into failure receipts let it through to the worker.
+    """
+
+
+def set_listener(listener):
+    """Install `listener(fraction)` for subsequent reports, or None to remove it."""
+    global _listener
+    _listener = listener
+
+
+def report(fraction: float):
+    """Report progress of the current action as a fraction in [0, 1]."""
+    if _listener is not None:
+        _listener(max(0.0, min(1.0, fraction)))
@@ -2,12 +2,19 @@
 Entry point for plus-worker Fargate tasks.
 
 Reads configuration from environment variables and executes the requested action.
+
+Only the standard library and the worker's own helpers are imported at module level;
+feaas.objects, the DAO, the PlusScript engine, protobuf's json_format and friends are
+imported by the code paths that use them (see MODE_IMPORTS), so each RUN_MODE pays
+only for its own dependencies at startup.
 """
+from __future__ import annotations
+
 from decimal import Decimal
+import importlib
 import json
 import logging
 import os
-import requests
 import sys
 import time
 import traceback
@@ -17,11 +24,7 @@ logging.getLogger('boto3').setLevel(logging.WARNING)
 logging.getLogger('botocore').setLevel(logging.WARNING)
 logging.getLogger('urllib3').setLevel(logging.WARNING)
 
-import feaas.objects as objs
-from feaas.dao.dao import DataAccessObject
-from feaas.psee.psee import PlusScriptExecutionEngine
-from feaas.util.common import build_action_class
-from google.protobuf.json_format import Parse, MessageToDict
+from src import action_index, progress
 
 # Search paths for action resolution (first match wins)
 ACTION_SEARCH_PATHS = [
@@ -48,12 +51,29 @@ MODE_REQUIRED_ENV = {
     'REGISTER_ACTIONS': [],  # Only needs base env vars
 }
 
+# Modules each mode imports lazily, loaded (and timed) up front by load_mode_imports()
+_JOB_IMPORTS = ['feaas.objects', 'feaas.dao.dao', 'feaas.psee.psee', 'google.protobuf.json_format']
+MODE_IMPORTS = {
+    'RUN_ACTION': ['feaas.objects', 'feaas.dao.dao', 'google.protobuf.json_format'],
+    'RUN_PLUSSCRIPT': _JOB_IMPORTS + ['feaas.util.common'],
+    'RUN_JOB': _JOB_IMPORTS,
+    'RUN_COLLECTION': _JOB_IMPORTS,
+    'RUN_STREAM': _JOB_IMPORTS,
+    'REGISTER_ACTIONS': ['boto3', 'feaas.dao.docstore.dynamo', 'src.catalog'],
+}
+
+
+class CancelledException(progress.Cancelled):
+    """Raised when job is cancelled via request_cancel flag.
 
-class CancelledException(Exception):
-    """Raised when job is cancelled via request_cancel flag."""
+    A BaseException (see src.progress.Cancelled), so actions can't swallow it.
+    """
     pass
 
 
+CANCELLED_MESSAGE = "Job was cancelled by user"
+
+
 class WorkerActionExecutor:
     """
     Action executor for the worker that uses local search paths.
@@ -72,11 +92,12 @@ class WorkerActionExecutor:
 
     def begin_action_execution(self, action_id, username, data, hostname=None) -> objs.Receipt:
         """Execute an action and return the receipt."""
+        import feaas.objects as objs
         print(f"  Executing action: {action_id}")
 
         try:
             # Resolve action class using worker search paths
-            ActionClass = build_action_class(action_id, search_paths=ACTION_SEARCH_PATHS)
+            ActionClass = action_index.resolve(action_id, ACTION_SEARCH_PATHS)
             action = ActionClass(self.dao)
 
             import inspect as _inspect
@@ -115,32 +136,83 @@ class WorkerActionExecutor:
             return objs.Receipt(success=False, error_message=msg)
 
 
+class ActionProgressWriter:
+    """
+    Persists in-action progress (see src.progress) for a single-action job.
+
+    Saves job_doc['percent'] at most every PROGRESS_INTERVAL_SECONDS, and checks for
+    cancellation on each save so a long ffmpeg run can be stopped mid-encode.
+    """
+
+    PROGRESS_INTERVAL_SECONDS = 10
+
+    def __init__(self, docstore, job_id: str):
+        self.docstore = docstore
+        self.job_id = job_id
+        self.last_save_time = 0
+        self.last_saved_percent = 0
+        self.cancelled = False
+
+    def __call__(self, fraction: float):
+        # Once cancelled, every report raises, so concurrent ffmpegs stop too
+        if self.cancelled:
+            raise CancelledException(CANCELLED_MESSAGE)
+        # Hold back 100% for the final status save
+        percent = min(int(fraction * 100), 99)
+        now = time.time()
+        if percent == self.last_saved_percent or now - self.last_save_time < self.PROGRESS_INTERVAL_SECONDS:
+            return
+        self.last_save_time = now
+        self.last_saved_percent = percent
+
+        job_doc = self.docstore.get_document(self.job_id)
+        if not job_doc:
+            return
+        if job_doc.get('request_cancel', False):
+            print("  Job cancellation requested!")
+            self.cancelled = True
+            raise CancelledException(CANCELLED_MESSAGE)
+        job_doc['percent'] = percent
+        job_doc['updated_at'] = int(now)
+        self.docstore.save_document(self.job_id, job_doc)
+        print(f"  Saving progress: {percent}%")
+
+
 class JobRunner:
     """
     Manages job execution with progress tracking and cancellation support.
 
     Progress is saved:
     - Every 60 seconds
-    - When percent changes
+    - When percent changes (in-action progress at most every 10 seconds)
 
     Cancellation is checked on each progress save.
     """
 
     SAVE_INTERVAL_SECONDS = 60
+    PROGRESS_INTERVAL_SECONDS = 10
 
-    def __init__(self, dao, job: objs.PlusScriptJob):
+    def __init__(self, dao, job: objs.PlusScriptJob, script: objs.PlusScript = None):
+        import feaas.objects as objs
         self.dao = dao
         self.docstore = dao.get_docstore()
         self.job = job
+        # `script` (e.g. the fused one) is what runs; saves keep the script as written
+        self.written_script = objs.PlusScript()
+        self.written_script.CopyFrom(job.script)
+        self.script = job.script if script is None else script
         self.last_save_time = time.time()
         self.last_saved_percent = 0
         self.total_actions = self._count_action_nodes()
         self.completed_actions = 0
+        self.action_fraction = 0.0
+        self.cancelled = False
 
     def _count_action_nodes(self) -> int:
         """Count total ACTION nodes in the script."""
+        import feaas.objects as objs
         count = 0
-        for node in self.job.script.nodes:
+        for node in self.script.nodes:
             if node.ntype == objs.PlusScriptNodeType.ACTION:
                 count += 1
         return max(count, 1)  # Avoid division by zero
@@ -148,11 +220,21 @@ class JobRunner:
     def on_action_complete(self):
         """Called after each action completes. May trigger progress save."""
         self.completed_actions += 1
+        self.action_fraction = 0.0
         self._maybe_save_progress()
 
+    def on_action_progress(self, fraction: float):
+        """Called (via src.progress) as the running action advances. Throttled saves."""
+        if self.cancelled:
+            raise CancelledException(CANCELLED_MESSAGE)
+        self.action_fraction = fraction
+        if time.time() - self.last_save_time >= self.PROGRESS_INTERVAL_SECONDS:
+            self._maybe_save_progress()
+
     def _calculate_percent(self) -> int:
         """Calculate current progress percentage."""
-        return int((self.completed_actions / self.total_actions) * 100)
+        done = min(self.completed_actions + self.action_fraction, self.total_actions)
+        return int((done / self.total_actions) * 100)
 
     def _maybe_save_progress(self):
         """Save progress if 60s elapsed or percent changed."""
@@ -177,7 +259,9 @@ class JobRunner:
         self.job.percent = percent
 
         # Save to DynamoDB
+        from google.protobuf.json_format import MessageToDict
         doc = MessageToDict(self.job, preserving_proto_field_name=True)
+        doc['script'] = MessageToDict(self.written_script, preserving_proto_field_name=True)
         self.docstore.save_document(self.job.object_id, doc)
 
         # Check for cancellation by reloading job
@@ -188,10 +272,12 @@ class JobRunner:
         doc = self.docstore.get_document(self.job.object_id)
         if doc and doc.get('request_cancel', False):
             print("  Job cancellation requested!")
-            raise CancelledException("Job was cancelled by user")
+            self.cancelled = True
+            raise CancelledException(CANCELLED_MESSAGE)
 
     def run(self) -> objs.PlusScriptJob:
         """Execute the job using PSEE and return the final job state."""
+        import feaas.objects as objs
         print(f"\nStarting PSEE execution...")
         print(f"  Total action nodes: {self.total_actions}")
 
@@ -199,10 +285,16 @@ class JobRunner:
         executor = WorkerActionExecutor(self.dao, self)
 
         # Create PSEE with our executor
+        from feaas.psee.psee import PlusScriptExecutionEngine
         psee = PlusScriptExecutionEngine(self.dao, executor)
 
+        progress.set_listener(self.on_action_progress)
         try:
             # Run the job - PSEE will call executor.begin_action_execution for each action
+            run = objs.PlusScriptJob()
+            run.CopyFrom(self.job)
+            run.script.CopyFrom(self.script)
+            self.job = run
             self.job = psee.run_job(self.job)
 
             # Update final counts
@@ -215,10 +307,15 @@ class JobRunner:
             print(f"  Actions: {executor.success_count} succeeded, {executor.error_count} failed")
 
         except CancelledException:
+            # PlusScriptStatus has no cancelled state; save_job(cancelled=True) records it
+            self.cancelled = True
             self.job.status = objs.PlusScriptStatus.FAILED
-            self.job.error_message = "Job was cancelled by user"
+            self.job.error_message = CANCELLED_MESSAGE
             self.job.success_count = executor.success_count
             self.job.error_count = executor.error_count
+        finally:
+            progress.set_listener(None)
+            self.job.script.CopyFrom(self.written_script)
 
         return self.job
 
@@ -241,6 +338,7 @@ def get_update_field_mappings(script: objs.PlusScript) -> dict:
 
     This is determined by edges that connect to the Update node.
     """
+    import feaas.objects as objs
     # Find the Update node (ntype = UPDATE_VALUES = 10)
     update_node = None
     update_node_id = None
@@ -334,6 +432,7 @@ def write_receipt_to_stream(streams, stream_id: str, receipt: objs.Receipt,
     # Include outputs if present, serialized to JSON-safe primitives. receipt.outputs
     # is a proto map of AnyType, which isn't directly DynamoDB-serializable.
     if receipt.outputs:
+        from google.protobuf.json_format import MessageToDict
         receipt_data['outputs'] = {k: MessageToDict(v) for k, v in receipt.outputs.items()}
 
     # A progress-stream write must never abort the batch: if it fails, log and
@@ -377,12 +476,31 @@ def check_env():
         print(f"  {var}={val}")
 
 
+def load_mode_imports(run_mode: str, action_id: str = None) -> tuple:
+    """Import what `run_mode` needs (MODE_IMPORTS, plus the action for RUN_ACTION).
+
+    Returns (seconds, number of modules newly imported). Later imports of the same
+    modules inside the mode's code are then free.
+    """
+    started = time.monotonic()
+    before = len(sys.modules)
+    for name in MODE_IMPORTS.get(run_mode, []):
+        importlib.import_module(name)
+    if run_mode == 'RUN_ACTION' and action_id:
+        try:
+            action_index.resolve(action_id, ACTION_SEARCH_PATHS)
+        except Exception:
+            pass  # run_action reports unresolvable actions itself
+    return time.monotonic() - started, len(sys.modules) - before
+
+
 def get_fargate_task_arn():
     """Get the Fargate task ARN from ECS metadata, if available."""
     metadata_uri = os.environ.get('ECS_CONTAINER_METADATA_URI_V4')
     if not metadata_uri:
         return None
     try:
+        import requests
         resp = requests.get(f"{metadata_uri}/task", timeout=2)
         if resp.status_code == 200:
             return resp.json().get('TaskARN')
@@ -408,6 +526,7 @@ def get_dao():
     if access_key and secret_key:
         props['ACCESS_KEY'] = access_key
         props['SECRET_KEY'] = secret_key
+    from feaas.dao.dao import DataAccessObject
     return DataAccessObject(props, running_as_worker=True)
 
 
@@ -420,6 +539,7 @@ def load_job(dao, job_id: str) -> tuple:
     - hostname
     - input_data
     """
+    import feaas.objects as objs
     docstore = dao.get_docstore()
     doc = docstore.get_document(job_id)
 
@@ -432,19 +552,49 @@ def load_job(dao, job_id: str) -> tuple:
             return int(obj) if obj % 1 == 0 else float(obj)
         raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
 
+    from google.protobuf.json_format import Parse
     job = Parse(json.dumps(doc, default=decimal_default), objs.PlusScriptJob(), ignore_unknown_fields=True)
     return job, doc
 
 
-def save_job(dao, job: objs.PlusScriptJob):
-    """Save PlusScriptJob back to DynamoDB."""
+def save_job(dao, job: objs.PlusScriptJob, cancelled: bool = False):
+    """Save PlusScriptJob back to DynamoDB, flagged `cancelled` if the user cancelled it."""
+    from google.protobuf.json_format import MessageToDict
     docstore = dao.get_docstore()
     doc = MessageToDict(job, preserving_proto_field_name=True)
+    if cancelled:
+        doc['cancelled'] = True
     docstore.save_document(job.object_id, doc)
 
 
+def fuse_script(script: objs.PlusScript) -> objs.PlusScript:
+    """Collapse contiguous ffmpeg nodes into single-invocation FusedChain nodes.
+
+    Set FFMPEG_FUSION=0 to run every ffmpeg node step by step.
+    """
+    if os.environ.get('FFMPEG_FUSION', '1') == '0':
+        return script
+    from src.actions.vendor.ffmpeg.fusion import fuse_ffmpeg_chains
+    fused, chains = fuse_ffmpeg_chains(script)
+    for chain in chains:
+        print(f"  Fused ffmpeg chain: {' -> '.join(n.label or n.action_id for n in chain)}")
+    return fused
+
+
+def sweep_scratch():
+    """Reclaim ffmpeg workspaces left behind by crashed or killed runs."""
+    try:
+        from src.actions.vendor.ffmpeg.workspace import sweep_orphans
+        removed = sweep_orphans()
+        if removed:
+            print(f"  Removed {removed} orphaned ffmpeg workspace(s)")
+    except Exception as e:
+        print(f"  WARNING: Failed to sweep ffmpeg workspaces: {e}")
+
+
 def run_job(force_job_type=None):
     """Run a PlusScriptJob using PSEE. Handles both collection and stream jobs."""
+    import feaas.objects as objs
     job_id = os.environ.get('JOB_ID')
     print(f"\nLoading job: {job_id}")
 
@@ -502,6 +652,10 @@ def run_job(force_job_type=None):
         print(f"ERROR: file_keys is required for run_on_files but not found in job doc", file=sys.stderr)
         sys.exit(1)
 
+    # Run contiguous ffmpeg nodes as one decode/encode instead of one per node. Only the
+    # run uses the fused copy; job.script (saved back to the job doc) stays as written.
+    script = fuse_script(job.script)
+
     # Update job to RUNNING
     now = int(time.time())
     job.started_at = now
@@ -518,17 +672,23 @@ def run_job(force_job_type=None):
     print(f"Job status updated to RUNNING")
 
     # Dispatch based on job_type
+    cancelled = False
     try:
         if job_type == 'run_on_collection':
-            job = run_on_collection(dao, job, hostname, collection_owner, input_data)
+            job = run_on_collection(dao, job, hostname, collection_owner, input_data, script)
         elif job_type == 'run_on_stream':
-            job = run_on_stream(dao, job, hostname, stream_id, input_data)
+            job = run_on_stream(dao, job, hostname, stream_id, input_data, script)
         elif job_type == 'run_on_files':
-            job = run_on_files(dao, job, hostname, file_keys, file_prefix, input_data)
+            job = run_on_files(dao, job, hostname, file_keys, file_prefix, input_data, script)
         else:
             # Singleton job - just run once
-            runner = JobRunner(dao, job)
+            runner = JobRunner(dao, job, script)
             job = runner.run()
+            cancelled = runner.cancelled
+    except CancelledException:
+        cancelled = True
+        job.status = objs.PlusScriptStatus.FAILED
+        job.error_message = CANCELLED_MESSAGE
     except Exception as e:
         print(f"ERROR: Job execution failed: {e}", file=sys.stderr)
         traceback.print_exc()
@@ -540,7 +700,7 @@ def run_job(force_job_type=None):
     job.updated_at = int(time.time())
 
     # Final save
-    save_job(dao, job)
+    save_job(dao, job, cancelled=cancelled)
 
     status_name = objs.PlusScriptStatus.Name(job.status)
     print(f"\nJob completed with status: {status_name}")
@@ -616,8 +776,11 @@ def search_by_owner(dao, owner: str) -> list:
 
 
 def run_on_collection(dao, job: objs.PlusScriptJob, hostname: str,
-                      collection_owner: str, input_data: dict) -> objs.PlusScriptJob:
-    """Run a script on each item in a collection."""
+                      collection_owner: str, input_data: dict,
+                      script: objs.PlusScript = None) -> objs.PlusScriptJob:
+    """Run a script (`script`, else job.script) on each item in a collection."""
+    import feaas.objects as objs
+    script = job.script if script is None else script
     print(f"\n{'='*60}")
     print(f"RUNNING ON COLLECTION: {collection_owner}")
     print(f"{'='*60}")
@@ -635,7 +798,7 @@ def run_on_collection(dao, job: objs.PlusScriptJob, hostname: str,
     print(f"  Found {len(items)} items to process")
 
     # Get Update node field mappings from the script
-    update_mappings = get_update_field_mappings(job.script)
+    update_mappings = get_update_field_mappings(script)
     if update_mappings:
         print(f"  Update mappings: {update_mappings}")
     else:
@@ -652,6 +815,7 @@ def run_on_collection(dao, job: objs.PlusScriptJob, hostname: str,
 
     # Create executor for tracking counts
     executor = WorkerActionExecutor(dao, None)
+    from feaas.psee.psee import PlusScriptExecutionEngine
     psee = PlusScriptExecutionEngine(dao, executor)
 
     success_count = 0
@@ -673,7 +837,7 @@ def run_on_collection(dao, job: objs.PlusScriptJob, hostname: str,
 
         try:
             # Start a fresh job for this item using the same script
-            item_job = psee.start_script(hostname, job.username, job.script, script_input)
+            item_job = psee.start_script(hostname, job.username, script, script_input)
 
             # Run the job until completion
             item_job = psee.run_job(item_job)
@@ -749,8 +913,11 @@ def run_on_collection(dao, job: objs.PlusScriptJob, hostname: str,
 
 
 def run_on_stream(dao, job: objs.PlusScriptJob, hostname: str,
-                  source_stream_id: str, input_data: dict) -> objs.PlusScriptJob:
-    """Run a script on each item in a stream."""
+                  source_stream_id: str, input_data: dict,
+                  script: objs.PlusScript = None) -> objs.PlusScriptJob:
+    """Run a script (`script`, else job.script) on each item in a stream."""
+    import feaas.objects as objs
+    script = job.script if script is None else script
     streams = dao.get_streams()
 
     print(f"\n{'='*60}")
@@ -771,7 +938,7 @@ def run_on_stream(dao, job: objs.PlusScriptJob, hostname: str,
     print(f"  Found {len(items)} items to process")
 
     # Get Update node field mappings from the script
-    update_mappings = get_update_field_mappings(job.script)
+    update_mappings = get_update_field_mappings(script)
     if update_mappings:
         print(f"  Update mappings: {update_mappings}")
     else:
@@ -787,6 +954,7 @@ def run_on_stream(dao, job: objs.PlusScriptJob, hostname: str,
 
     # Create executor for tracking counts
     executor = WorkerActionExecutor(dao, None)
+    from feaas.psee.psee import PlusScriptExecutionEngine
     psee = PlusScriptExecutionEngine(dao, executor)
 
     success_count = 0
@@ -811,7 +979,7 @@ def run_on_stream(dao, job: objs.PlusScriptJob, hostname: str,
 
         try:
             # Start a fresh job for this item using the same script
-            item_job = psee.start_script(hostname, job.username, job.script, script_input)
+            item_job = psee.start_script(hostname, job.username, script, script_input)
 
             # Run until completion
             item_job = psee.run_job(item_job)
@@ -885,8 +1053,11 @@ def run_on_stream(dao, job: objs.PlusScriptJob, hostname: str,
 
 
 def run_on_files(dao, job: objs.PlusScriptJob, hostname: str,
-                 file_keys: list, prefix: str, input_data: dict) -> objs.PlusScriptJob:
-    """Ticket #4865: Run a script on each file in the provided file_keys list."""
+                 file_keys: list, prefix: str, input_data: dict,
+                 script: objs.PlusScript = None) -> objs.PlusScriptJob:
+    """Ticket #4865: Run a script (`script`, else job.script) on each file in file_keys."""
+    import feaas.objects as objs
+    script = job.script if script is None else script
     print(f"\n{'='*60}")
     print(f"RUNNING ON FILES: {len(file_keys)} files")
     print(f"{'='*60}")
@@ -909,6 +1080,7 @@ def run_on_files(dao, job: objs.PlusScriptJob, hostname: str,
 
     # Create executor for running scripts
     executor = WorkerActionExecutor(dao, None)
+    from feaas.psee.psee import PlusScriptExecutionEngine
     psee = PlusScriptExecutionEngine(dao, executor)
 
     success_count = 0
@@ -931,7 +1103,7 @@ def run_on_files(dao, job: objs.PlusScriptJob, hostname: str,
 
         try:
             # Run the script for this file
-            item_job = psee.start_script(hostname, job.username, job.script, script_input)
+            item_job = psee.start_script(hostname, job.username, script, script_input)
             item_job = psee.run_job(item_job)
             while item_job.status == objs.PlusScriptStatus.RUNNING:
                 item_job = psee.run_job(item_job)
@@ -996,7 +1168,7 @@ def run_on_files(dao, job: objs.PlusScriptJob, hostname: str,
 
 
 def register_actions():
-    """Crawl and register all worker actions.
+    """Register all worker actions, publishing only what changed.
 
     Mirrors plus-engine's upload_actions.py shape so plus-worker is a first-class
     peer service in the catalog universe:
@@ -1006,14 +1178,20 @@ def register_actions():
       - registry doc → sys.actions.plus-worker.plus-worker (kept inline for
         consumers that still read it directly; otherwise they should switch to
         the S3 pointer)
+
+    The catalog comes from the build-time artifact (src.catalog.CATALOG_PATH) when the
+    image has one, else from crawling src/actions. Both docs record the catalog hash;
+    a target whose doc already carries the current hash, and whose actions.json is still
+    in S3, is skipped, and the rest are written concurrently. REGISTER_ACTIONS_CRAWL=1 forces a crawl and
+    REGISTER_ACTIONS_FORCE=1 republishes everything.
     """
     import json as _json
     import time
+    from concurrent.futures import ThreadPoolExecutor
 
     import boto3
-    from plus_engine.acrawler import AvailableActionCrawler
     from feaas.dao.docstore.dynamo import DynamoDocstore
-    from google.protobuf.json_format import MessageToDict
+    from src import catalog
 
     print("\nRegistering plus-worker actions...")
 
@@ -1025,6 +1203,7 @@ def register_actions():
     bucket_name = os.environ.get('PRIMARY_BUCKET')
     region = os.environ.get('REGION', 'us-east-1')
     hostname = os.environ.get('HOSTNAME', 'plus_dataskeptic_com')
+    force = os.environ.get('REGISTER_ACTIONS_FORCE') == '1'
     s3_client = boto3.client(
         's3',
         region_name=region,
@@ -1032,67 +1211,101 @@ def register_actions():
         aws_secret_access_key=os.environ.get('SECRET_KEY'),
     )
 
-    print("Crawling for actions in: src/actions")
-    crawler = AvailableActionCrawler(
-        sys_name='plus-worker',
-        dao=None,
-        module_prefix='src/actions',
-        owner='sys.action',
-        extra_sys_paths=['.']
-    )
-    action_mapping = crawler.get_actions()
-    print(f"Found {len(action_mapping)} actions")
+    actions_data = None
+    if os.environ.get('REGISTER_ACTIONS_CRAWL') != '1':
+        actions_data = catalog.load_catalog()
+    if actions_data is not None:
+        print(f"Loaded {len(actions_data)} actions from {catalog.CATALOG_PATH}")
+    else:
+        actions_data = catalog.build_catalog()
+    action_hashes = {action_id: entry.get('content_hash') or catalog.content_hash(entry)
+                     for action_id, entry in actions_data.items()}
+    catalog_hash = catalog.catalog_hash(actions_data)
+    print(f"Catalog hash: {catalog_hash[:12]}")
+
+    owner = 'sys.actions.plus-worker'
+    object_id = f'{owner}.plus-worker'
+    frontend_object_id = f'sys.{hostname}.plusworker.plus-worker'
 
-    actions_data = {}
-    for action_id, action_class in action_mapping.items():
+    def get_doc(doc_id):
         try:
-            action_instance = action_class(dao=None)
-            params_info = [MessageToDict(p, preserving_proto_field_name=True)
-                           for p in action_instance.action.params]
-            outputs_info = [MessageToDict(o, preserving_proto_field_name=True)
-                            for o in action_instance.action.outputs]
-            actions_data[action_id] = {
-                'action_id': action_id,
-                'runtime': 'fargate',
-                'class_path': f"{action_class.__module__}.{action_class.__name__}",
-                'label': getattr(action_instance.action, 'label', '') or action_class.__name__,
-                'short_desc': getattr(action_instance.action, 'short_desc', ''),
-                'params': params_info,
-                'outputs': outputs_info,
-                'sys_name': 'plus-worker',
-            }
-            print(f"  {action_id}")
+            return docstore.get_document(doc_id) or {}
         except Exception as e:
-            print(f"  {action_id} (error: {e})")
-            actions_data[action_id] = {
-                'action_id': action_id,
-                'runtime': 'fargate',
-                'class_path': f"{action_class.__module__}.{action_class.__name__}",
-                'label': action_class.__name__,
-                'sys_name': 'plus-worker',
-            }
+            print(f"  Could not read {doc_id}: {e}")
+            return {}
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        registry_doc, frontend_doc = pool.map(get_doc, [object_id, frontend_object_id])
+
+    previous_hashes = registry_doc.get('action_hashes') or {}
+    added = sorted(set(action_hashes) - set(previous_hashes))
+    removed = sorted(set(previous_hashes) - set(action_hashes))
+    changed = sorted(a for a in set(action_hashes) & set(previous_hashes)
+                     if action_hashes[a] != previous_hashes[a])
+    for label, ids in (('Added', added), ('Changed', changed), ('Removed', removed)):
+        if ids:
+            print(f"  {label}: {', '.join(ids)}")
+
+    def s3_object_exists(key):
+        """Whether `key` is in the bucket; False if that can't be confirmed, so it gets republished."""
+        try:
+            s3_client.head_object(Bucket=bucket_name, Key=key)
+            return True
+        except Exception as e:
+            print(f"  {key} is missing from s3://{bucket_name} ({e})")
+            return False
+
+    registry_current = (not force and registry_doc.get('catalog_hash') == catalog_hash
+                        and bool(registry_doc.get('actions_s3_key')) == bool(bucket_name)
+                        and (not bucket_name or s3_object_exists(registry_doc['actions_s3_key'])))
+    frontend_current = (not force and frontend_doc.get('catalog_hash') == catalog_hash
+                        and bool(bucket_name) and bool(frontend_doc.get('actions_s3_key'))
+                        and s3_object_exists(frontend_doc['actions_s3_key']))
 
     actions_json = _json.dumps(actions_data)
     actions_kb = len(actions_json.encode('utf-8')) / 1024
-    s3_key = None
-    if bucket_name:
-        s3_key = 'sys/actions/plus-worker/actions.json'
-        print(f"\nUploading actions to S3: s3://{bucket_name}/{s3_key} ({actions_kb:.1f} KB)")
-        try:
-            s3_client.put_object(Bucket=bucket_name, Key=s3_key, Body=actions_json,
-                                 ContentType='application/json')
-            print('  ✓ S3 upload successful')
-        except Exception as e:
-            print(f'  ✗ S3 upload failed: {e}')
-            s3_key = None
 
+    def publish_registry():
+        s3_key = None
+        if bucket_name:
+            s3_key = 'sys/actions/plus-worker/actions.json'
+            print(f"Uploading actions to S3: s3://{bucket_name}/{s3_key} ({actions_kb:.1f} KB)")
+            try:
+                s3_client.put_object(Bucket=bucket_name, Key=s3_key, Body=actions_json,
+                                     ContentType='application/json')
+                print('  ✓ S3 upload successful')
+            except Exception as e:
+                print(f'  ✗ S3 upload failed: {e}')
+                s3_key = None
+
+        if s3_key:
+            doc = {
+                'object_id': object_id,
+                'owner': owner,
+                'source': 'plus-worker',
+                'actions_s3_key': s3_key,
+                'actions_count': len(actions_data),
+                'last_updated_at': int(time.time() * 1000),
+            }
+        else:
+            doc = {
+                'object_id': object_id,
+                'owner': owner,
+                'source': 'plus-worker',
+                'actions': actions_data,
+            }
+        doc['catalog_hash'] = catalog_hash
+        doc['action_hashes'] = action_hashes
+        print(f"Uploading registry to: {object_id}")
+        docstore.save_document(object_id, doc)
+
+    def publish_frontend():
         frontend_s3_key = f'sys/{hostname}/plusworker/plus-worker/actions.json'
         print(f"Uploading frontend catalog to S3: s3://{bucket_name}/{frontend_s3_key}")
         try:
             s3_client.put_object(Bucket=bucket_name, Key=frontend_s3_key, Body=actions_json,
                                  ContentType='application/json')
             print('  ✓ Frontend S3 upload successful')
-            frontend_object_id = f'sys.{hostname}.plusworker.plus-worker'
             docstore.save_document(frontend_object_id, {
                 'object_id': frontend_object_id,
                 'owner': f'sys.{hostname}.plusworker',
@@ -1100,33 +1313,27 @@ def register_actions():
                 'actions_s3_key': frontend_s3_key,
                 'actions_count': len(actions_data),
                 'last_updated_at': int(time.time() * 1000),
+                'catalog_hash': catalog_hash,
             })
             print(f'  ✓ Frontend metadata doc updated ({len(actions_data)} actions)')
         except Exception as e:
             print(f'  ✗ Frontend upload failed: {e}')
+
+    tasks = []
+    if registry_current:
+        print("Registry is up to date, skipping")
     else:
+        tasks.append(publish_registry)
+    if not bucket_name:
         print('Warning: PRIMARY_BUCKET not set, skipping S3 upload')
-
-    owner = 'sys.actions.plus-worker'
-    object_id = f'{owner}.plus-worker'
-    if s3_key:
-        doc = {
-            'object_id': object_id,
-            'owner': owner,
-            'source': 'plus-worker',
-            'actions_s3_key': s3_key,
-            'actions_count': len(actions_data),
-            'last_updated_at': int(time.time() * 1000),
-        }
+    elif frontend_current:
+        print("Frontend catalog is up to date, skipping")
     else:
-        doc = {
-            'object_id': object_id,
-            'owner': owner,
-            'source': 'plus-worker',
-            'actions': actions_data,
-        }
-    print(f"\nUploading registry to: {object_id}")
-    docstore.save_document(object_id, doc)
+        tasks.append(publish_frontend)
+
+    with ThreadPoolExecutor(max_workers=max(1, len(tasks))) as pool:
+        for future in [pool.submit(task) for task in tasks]:
+            future.result()
     print(f"Registered {len(actions_data)} actions")
 
 
@@ -1136,6 +1343,7 @@ def run_action():
     Loads the job document from DynamoDB, updates status to RUNNING, executes the
     action, then saves the receipt and final status (COMPLETED/FAILED) back.
     """
+    import feaas.objects as objs
     action_id = os.environ.get('ACTION_ID')
     username = os.environ.get('USERNAME')
     job_id = os.environ.get('JOB_ID')
@@ -1181,7 +1389,7 @@ def run_action():
 
     # Resolve and instantiate action class
     try:
-        ActionClass = build_action_class(action_id, search_paths=ACTION_SEARCH_PATHS)
+        ActionClass = action_index.resolve(action_id, ACTION_SEARCH_PATHS)
         action = ActionClass(dao)
         print(f"  resolved to: {ActionClass.__module__}.{ActionClass.__name__}")
     except ModuleNotFoundError as e:
@@ -1211,12 +1419,21 @@ def run_action():
 
     print(f"\nExecuting action...")
     receipt = None
+    cancelled = False
+    if job_id:
+        progress.set_listener(ActionProgressWriter(docstore, job_id))
     try:
         receipt = action.execute_action(**inputs)
+    except CancelledException:
+        print(f"\nAction cancelled")
+        cancelled = True
+        receipt = objs.Receipt(success=False, error_message=CANCELLED_MESSAGE)
     except Exception as e:
         print(f"ERROR: Action execution failed: {e}", file=sys.stderr)
         traceback.print_exc()
         receipt = objs.Receipt(success=False, error_message=str(e))
+    finally:
+        progress.set_listener(None)
 
     # Save receipt and final status to job document
     if job_id:
@@ -1230,13 +1447,14 @@ def run_action():
             if receipt and receipt.success:
                 job_doc['status'] = 'SUCCEEDED'
                 if receipt.outputs:
+                    from google.protobuf.json_format import MessageToDict
                     job_doc['receipt'] = {
                         'success': True,
                         'outputs': {k: MessageToDict(v) for k, v in receipt.outputs.items()},
                         'primary_output': receipt.primary_output or '',
                     }
             else:
-                job_doc['status'] = 'FAILED'
+                job_doc['status'] = 'CANCELLED' if cancelled else 'FAILED'
                 error_msg = receipt.error_message if receipt else 'Unknown error'
                 job_doc['error_message'] = error_msg
                 job_doc['receipt'] = {
@@ -1264,6 +1482,7 @@ def run_action():
 
 def run_plusscript():
     """Execute a PlusScript on Fargate."""
+    import feaas.objects as objs
     script_object_id = os.environ.get('ACTION_ID')  # ACTION_ID carries the script object ID
     username = os.environ.get('USERNAME', 'system')
     action_input_json = os.environ.get('ACTION_INPUT_JSON', '{}')
@@ -1297,6 +1516,7 @@ def run_plusscript():
     script_username = parts[1]
 
     from feaas.util.common import clean_script_dict_for_protobuf, DecimalEncoder
+    from google.protobuf.json_format import Parse
     import copy
 
     def _clean_node_buffer_byvals(obj):
@@ -1319,8 +1539,10 @@ def run_plusscript():
     script_dict = clean_script_dict_for_protobuf(script_doc)
     script_dict = _clean_node_buffer_byvals(copy.deepcopy(script_dict))
     plus_script = Parse(json.dumps(script_dict, cls=DecimalEncoder), objs.PlusScript(), ignore_unknown_fields=True)
+    plus_script = fuse_script(plus_script)
 
     executor = WorkerActionExecutor(dao, None)
+    from feaas.psee.psee import PlusScriptExecutionEngine
     psee = PlusScriptExecutionEngine(dao, executor)
 
     try:
@@ -1346,10 +1568,18 @@ def main():
     print("=" * 50)
 
     check_env()
+    sweep_scratch()
 
     run_mode = os.environ.get('RUN_MODE')
     print(f"\nRUN_MODE: {run_mode}")
 
+    if os.environ.get('WORKER_IMPORT_REPORT') == '1':
+        from src import import_report
+        import_report.log_report(run_mode, os.environ.get('ACTION_ID'))
+    if run_mode in MODE_IMPORTS:
+        elapsed, count = load_mode_imports(run_mode, os.environ.get('ACTION_ID'))
+        print(f"  Imported {count} modules for {run_mode} in {elapsed:.2f}s")
+
     if run_mode == 'RUN_JOB':
         run_job()
     elif run_mode == 'RUN_COLLECTION':
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Cold-start regression check for RUN_ACTION.
+
+Profiles what a fresh RUN_ACTION worker imports before running its action (see
+src/import_report.py), and fails if that takes longer than the budget or pulls in
+modules only other modes need.
+
+Usage:
+    python test_scripts/test_cold_start.py
+
+Runs locally against the installed dependencies (no AWS access needed). Optional
+environment variables:
+    - ACTION_ID               action to resolve (default ffmpeg.probe)
+    - COLD_START_BUDGET_MS    import-time budget in ms (default 1500)
+    - COLD_START_RUNS         profile this many times and keep the fastest (default 3)
+"""
+import os
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src import import_report
+
+# Imported by other modes only; RUN_ACTION must not pay for them
+FORBIDDEN_PREFIXES = [
+    'feaas.psee',
+    'requests',
+    'plus_engine.acrawler',
+    'src.catalog',
+    'playwright',
+]
+
+
+def main():
+    action_id = os.environ.get('ACTION_ID', 'ffmpeg.probe')
+    budget_ms = float(os.environ.get('COLD_START_BUDGET_MS', 1500))
+    runs = max(1, int(os.environ.get('COLD_START_RUNS', 3)))
+
+    print(f"Profiling RUN_ACTION cold start for {action_id} ({runs} runs)")
+    reports = [import_report.profile('RUN_ACTION', action_id) for _ in range(runs)]
+    report = min(reports, key=lambda r: r['import_us'])
+    print(import_report.format_report(report))
+
+    failures = []
+    import_ms = report['import_us'] / 1000
+    if import_ms > budget_ms:
+        failures.append(f"imports took {import_ms:.0f} ms, over the {budget_ms:.0f} ms budget")
+
+    for module in report['modules']:
+        if any(module == p or module.startswith(p + '.') for p in FORBIDDEN_PREFIXES):
+            failures.append(f"imported {module}, which RUN_ACTION doesn't need")
+
+    # Only the requested action's module should load, not every ffmpeg action
+    action_modules = {m for m in report['modules'] if m.startswith('src.actions.vendor.ffmpeg.')}
+    expected = 'src.actions.vendor.ffmpeg.' + action_id.split('.', 1)[-1]
+    for module in sorted(action_modules):
+        if module.count('.') == 4 and module != expected and module.rsplit('.', 1)[-1] in _action_module_names():
+            failures.append(f"imported {module} as well as {expected}")
+
+    if failures:
+        print("\nFAIL:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print(f"\nPASS: {import_ms:.0f} ms (budget {budget_ms:.0f} ms)")
+
+
+def _action_module_names() -> set:
+    """Module names of the ffmpeg actions (the package's lazy exports)."""
+    from src.actions.vendor import ffmpeg
+    return set(ffmpeg._MODULES.values())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""Action id resolution through the precomputed index (src.action_index)."""
+import json
+
+import pytest
+
+from src import action_index
+
+SEARCH_PATHS = [action_index.LOCAL_SEARCH_PATH, 'plus_engine.actions', 'feaas.actions']
+
+
+class Located:
+    pass
+
+
+@pytest.fixture
+def probing(monkeypatch):
+    """Record the search paths resolve() falls back to probing."""
+    common = pytest.importorskip("feaas.util.common")
+    probed = []
+    monkeypatch.setattr(common, 'build_action_class',
+                        lambda action_id, search_paths: probed.append(list(search_paths)) or Located)
+    return probed
+
+
+@pytest.fixture(autouse=True)
+def no_stamp(monkeypatch, tmp_path):
+    monkeypatch.setattr(action_index, 'STAMP_PATH', str(tmp_path / 'sources_hash'))
+
+
+def use_index(monkeypatch, tmp_path, index):
+    path = tmp_path / 'action_index.json'
+    path.write_text(json.dumps(index))
+    monkeypatch.setattr(action_index, '_index', None)
+    action_index.load_index(str(path))  # cached for resolve()
+
+
+def test_indexed_ids_are_imported_directly(monkeypatch, tmp_path, probing):
+    use_index(monkeypatch, tmp_path, {'sources_hash': action_index.sources_hash(), 'actions': {
+        'x.Located': {'module': __name__, 'class': 'Located'}}})
+    assert action_index.resolve('x.Located', SEARCH_PATHS) is Located
+    assert probing == []
+
+
+def test_current_index_skips_probing_the_local_path(monkeypatch, tmp_path, probing):
+    use_index(monkeypatch, tmp_path, {'sources_hash': action_index.sources_hash(), 'actions': {}})
+    action_index.resolve('engine.Thing', SEARCH_PATHS)
+    assert probing == [SEARCH_PATHS[1:]]
+
+
+def test_stale_index_is_ignored(monkeypatch, tmp_path, probing):
+    # An action added after the index was built must still resolve from src.actions.vendor
+    use_index(monkeypatch, tmp_path, {'sources_hash': 'old', 'actions': {
+        'x.Located': {'module': 'gone.module', 'class': 'Located'}}})
+    assert action_index.resolve('x.Located', SEARCH_PATHS) is Located
+    assert probing == [SEARCH_PATHS]
+
+
+def test_no_index_probes_every_path(monkeypatch, tmp_path, probing):
+    monkeypatch.setattr(action_index, '_index', None)
+    assert action_index.load_index(str(tmp_path / 'missing.json')) == {}
+    action_index.resolve('engine.Thing', SEARCH_PATHS)
+    assert probing == [SEARCH_PATHS]
+
+
+def test_check_reports_a_stale_index(probing):
+    index = {'sources_hash': 'old', 'actions': {'x.Gone': {'module': 'm', 'class': 'Gone'}}}
+    problems = action_index.check(index, {'x.New': Located}, SEARCH_PATHS)
+    assert any('changed since' in p for p in problems)
+    assert any(p.startswith('x.New: missing') for p in problems)
+    assert any(p.startswith('x.Gone: in the index') for p in problems)
+
+
+def test_stamped_image_does_not_rehash_the_sources(monkeypatch, tmp_path, probing):
+    (tmp_path / 'sources_hash').write_text('built\n')
+    monkeypatch.setattr(action_index, 'sources_hash', lambda *a: pytest.fail('re-hashed'))
+    use_index(monkeypatch, tmp_path, {'sources_hash': 'built', 'actions': {
+        'x.Located': {'module': __name__, 'class': 'Located'}}})
+    assert action_index.resolve('x.Located', SEARCH_PATHS) is Located
+    assert probing == []
+
+
+def test_check_reports_ids_that_fail_to_import_or_resolve(monkeypatch):
+    common = pytest.importorskip("feaas.util.common")
+
+    def build_action_class(action_id, search_paths):
+        raise ModuleNotFoundError(action_id)
+
+    monkeypatch.setattr(common, 'build_action_class', build_action_class)
+    index = {'sources_hash': action_index.sources_hash(), 'actions': {
+        'x.Located': {'module': __name__, 'class': 'Located'},
+        'x.Broken': {'module': 'no.such.module', 'class': 'Broken'}}}
+    problems = action_index.check(index, {'x.Located': Located, 'x.Broken': Located}, SEARCH_PATHS)
+    assert any(p.startswith('x.Broken: index gives no.such.module.Broken, which fails to import') for p in problems)
+    assert any(p.startswith('x.Located: probing the search paths fails') for p in problems)
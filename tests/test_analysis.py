@@ -0,0 +1,105 @@
+"""NumPy audio analysis in src.actions.vendor.ffmpeg.analysis."""
+import re
+import shutil
+import subprocess
+
+import pytest
+
+np = pytest.importorskip("numpy")
+from src.actions.vendor.ffmpeg import analysis  # noqa: E402
+
+ffmpeg = pytest.mark.skipif(not shutil.which("ffmpeg"), reason="needs ffmpeg")
+
+
+def test_mean_volume_averages_power_over_channels():
+    left = np.full(1000, 0.5, dtype=np.float32)
+    right = np.zeros(1000, dtype=np.float32)
+    stereo = np.stack([left, right], axis=1)
+    # half the samples at -6.02 dBFS, half silent: -9.03 dBFS
+    assert analysis.mean_volume_db(stereo) == pytest.approx(-9.03, abs=0.01)
+    assert analysis.mean_volume_db(left[:, None]) == pytest.approx(-6.02, abs=0.01)
+
+
+def test_mean_volume_of_silence_is_the_floor():
+    assert analysis.mean_volume_db(np.zeros((10, 2), dtype=np.float32)) == analysis.FLOOR_DB
+    assert analysis.mean_volume_db(np.zeros((0, 2), dtype=np.float32)) == analysis.FLOOR_DB
+
+
+@ffmpeg
+def test_mean_volume_matches_volumedetect_on_stereo(tmp_path):
+    fixture = tmp_path / "stereo.wav"
+    subprocess.run(["ffmpeg", "-v", "error", "-f", "lavfi", "-i",
+                    "aevalsrc=exprs=0.5*sin(2*PI*440*t)|0.1*sin(2*PI*660*t):s=44100:d=2",
+                    str(fixture)], check=True)
+    detect = subprocess.run(["ffmpeg", "-i", str(fixture), "-af", "volumedetect", "-f", "null", "-"],
+                            capture_output=True, text=True, check=True)
+    expected = float(re.search(r"mean_volume:\s*(-?[\d.]+) dB", detect.stderr).group(1))
+
+    def decode(channels):
+        raw = tmp_path / f"{channels}.f32"
+        subprocess.run(["ffmpeg", "-v", "error", "-i", str(fixture), "-ac", str(channels), "-ar", "44100",
+                        "-f", "f32le", str(raw)], check=True)
+        return np.fromfile(raw, dtype="<f4").reshape(-1, channels)
+
+    assert analysis.mean_volume_db(decode(2)) == pytest.approx(expected, abs=0.1)
+    # A mono downmix halves the power of these uncorrelated channels
+    assert abs(analysis.mean_volume_db(decode(1)) - expected) > 2
+
+
+def test_rms_measurement_decodes_at_the_source_channel_count(monkeypatch):
+    pytest.importorskip("feaas.objects")
+    from src.actions.vendor.ffmpeg import normalize_audio
+
+    decoded = []
+
+    def pcm(self, key, sample_rate=44100, channels=1, local_path=None, threads=None):
+        decoded.append(channels)
+        return np.stack([np.full(100, 0.5, dtype=np.float32), np.zeros(100, dtype=np.float32)], axis=1)
+
+    streams = {'streams': [{'codec_type': 'video'}, {'codec_type': 'audio', 'channels': 2}]}
+    monkeypatch.setattr(normalize_audio.NormalizeAudio, 'pcm', pcm)
+    monkeypatch.setattr(normalize_audio.NormalizeAudio, 'probe', lambda self, key, local_path=None: streams)
+    monkeypatch.setattr(normalize_audio.NormalizeAudio, 'etag', lambda self, key: None)
+    action = normalize_audio.NormalizeAudio.__new__(normalize_audio.NormalizeAudio)
+    measured = action.measure('a.mp4', '/tmp/a.mp4', -16.0, 'rms')
+    assert decoded == [2]
+    assert measured['mean_volume'] == pytest.approx(-9.03, abs=0.01)
+
+
+def tone_between(rate, lead, body, tail, level=0.5):
+    """`lead` seconds of silence, `body` seconds at `level`, then `tail` seconds of silence."""
+    return np.concatenate([np.zeros(int(rate * lead), dtype=np.float32),
+                           np.full(int(rate * body), level, dtype=np.float32),
+                           np.zeros(int(rate * tail), dtype=np.float32)])
+
+
+def test_silence_bounds_trim_long_leading_and_trailing_silence():
+    samples = tone_between(1000, 1.0, 2.0, 1.5)
+    start, end = analysis.silence_bounds(samples, 1000, threshold_db=-50, min_silence_sec=0.5)
+    assert start == pytest.approx(1.0, abs=0.02)
+    assert end == pytest.approx(3.0, abs=0.02)
+
+
+def test_silence_shorter_than_the_minimum_is_kept():
+    samples = tone_between(1000, 0.2, 2.0, 0.3)
+    assert analysis.silence_bounds(samples, 1000, threshold_db=-50, min_silence_sec=0.5) == (0.0, 2.5)
+
+
+def test_quiet_audio_below_threshold_counts_as_silence():
+    samples = np.concatenate([tone_between(1000, 0, 1.0, 0, level=0.001), tone_between(1000, 0, 1.0, 0)])
+    start, end = analysis.silence_bounds(samples, 1000, threshold_db=-40, min_silence_sec=0.5)
+    assert start == pytest.approx(1.0, abs=0.02) and end == pytest.approx(2.0)
+
+
+def test_all_silence_has_no_bounds():
+    assert analysis.silence_bounds(np.zeros(5000, dtype=np.float32), 1000, -50, 0.5) is None
+    assert analysis.silence_bounds(np.zeros(0, dtype=np.float32), 1000, -50, 0.5) is None
+
+
+def test_window_levels_span_chunks(monkeypatch):
+    monkeypatch.setattr(analysis, 'CHUNK_SAMPLES', 64)
+    samples = tone_between(1000, 0.1, 0.1, 0.1)
+    levels = analysis.window_levels_db(samples, 1000, window=0.02)
+    assert len(levels) == 15
+    assert (levels[5:10] > -7).all()
+    assert levels[:5] == pytest.approx([analysis.FLOOR_DB] * 5, abs=0.01)
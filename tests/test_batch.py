@@ -0,0 +1,64 @@
+"""The shared Batch* helpers on FFMPEGAction."""
+import threading
+
+import pytest
+
+pytest.importorskip("feaas.objects")
+base = pytest.importorskip("src.actions.vendor.ffmpeg.base")
+
+
+@pytest.fixture
+def action():
+    action = base.FFMPEGAction.__new__(base.FFMPEGAction)
+    listed = []
+
+    class Store:
+        def ls(self, prefix, delimiter):
+            listed.append(prefix)
+            return [prefix + 'a.mp4', prefix + 'b.gif', prefix + 'c.mp4']
+
+    action.blobstore = Store()
+    action.listed = listed
+    return action
+
+
+def test_batch_keys_lists_the_prefix_as_a_folder(action):
+    assert action.batch_keys('clips') == ['clips/a.mp4', 'clips/b.gif', 'clips/c.mp4']
+    assert action.listed == ['clips/']
+
+
+def test_batch_keys_filters_prefix_listings_and_file_lists(action):
+    def keep(key):
+        return key.endswith('.mp4')
+    assert action.batch_keys('clips/', keep=keep) == ['clips/a.mp4', 'clips/c.mp4']
+    assert action.batch_keys(files=['x.mp4', 'y.gif'], keep=keep) == ['x.mp4']
+    assert action.batch_keys() == []
+
+
+def test_run_batch_keeps_order_and_isolates_failures(action, monkeypatch):
+    progress = []
+    monkeypatch.setattr(base, 'report_progress', progress.append)
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def handle(item):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        try:
+            if item == 3:
+                raise ValueError('bad input')
+            return item * 10
+        finally:
+            with lock:
+                running[0] -= 1
+
+    assert action.run_batch(handle, [1, 2, 3, 4], parallel=2, progress_range=(0.5, 1.0)) == [10, 20, None, 40]
+    assert peak[0] <= 2
+    assert sorted(progress) == [0.625, 0.75, 0.875, 1.0]
+
+
+def test_batch_receipt_counts_failures(action):
+    receipt = action.batch_receipt(['a.gif', None, 'c.gif'], 3)
+    assert receipt.success and receipt.primary_output == 'files'
+    assert list(receipt.outputs['files'].svals) == ['a.gif', 'c.gif']
+    assert receipt.outputs['failed'].ival == 1
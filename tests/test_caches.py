@@ -0,0 +1,78 @@
+"""Keying and invalidation of the probe and PCM caches."""
+import os
+
+import pytest
+
+from src.actions.vendor.ffmpeg.pcm_cache import PcmCache
+from src.actions.vendor.ffmpeg.probe_cache import ProbeCache
+
+
+def test_probe_cache_is_keyed_by_etag():
+    cache = ProbeCache()
+    cache.put('a.mp4', 'etag-1', {'format': 1})
+    assert cache.get('a.mp4', 'etag-1') == {'format': 1}
+    assert cache.get('a.mp4', 'etag-2') is None
+    assert cache.get('b.mp4', 'etag-1') is None
+
+
+def test_probe_cache_ignores_blobs_without_an_etag():
+    cache = ProbeCache()
+    cache.put('a.mp4', None, {'format': 1})
+    assert cache.get('a.mp4', None) is None
+    assert cache.get('a.mp4') is None
+
+
+def test_probe_cache_invalidate_forgets_every_version_of_a_key():
+    cache = ProbeCache()
+    cache.put('a.mp4', 'etag-1', {'v': 1})
+    cache.put('a.mp4', 'etag-2', {'v': 2})
+    cache.put('b.mp4', 'etag-1', {'v': 3})
+    cache.invalidate('a.mp4')
+    assert cache.get('a.mp4', 'etag-1') is None and cache.get('a.mp4', 'etag-2') is None
+    assert cache.get('b.mp4', 'etag-1') == {'v': 3}
+
+
+def test_probe_cache_evicts_least_recently_used():
+    cache = ProbeCache(max_entries=2)
+    cache.put('a', 'e', {'v': 'a'})
+    cache.put('b', 'e', {'v': 'b'})
+    cache.get('a', 'e')
+    cache.put('c', 'e', {'v': 'c'})
+    assert cache.get('b', 'e') is None
+    assert cache.get('a', 'e') == {'v': 'a'} and cache.get('c', 'e') == {'v': 'c'}
+
+
+def test_probe_cache_persists_to_disk(tmp_path):
+    ProbeCache(str(tmp_path)).put('a.mp4', 'etag-1', {'format': 1})
+    fresh = ProbeCache(str(tmp_path))
+    assert fresh.get('a.mp4', 'etag-1') == {'format': 1}
+    assert fresh.get('a.mp4', 'etag-2') is None
+
+
+def test_pcm_cache_keys_on_etag_rate_and_channels(tmp_path):
+    cache = PcmCache(str(tmp_path))
+    path = cache.path('a.wav', 'etag-1', 44100, 2)
+    assert cache.path('a.wav', 'etag-1', 44100, 2) == path
+    others = {cache.path('a.wav', 'etag-2', 44100, 2), cache.path('a.wav', 'etag-1', 16000, 2),
+              cache.path('a.wav', 'etag-1', 44100, 1), cache.path('b.wav', 'etag-1', 44100, 2)}
+    assert path not in others and len(others) == 4
+
+
+def test_pcm_cache_stores_frames_by_channel(tmp_path):
+    np = pytest.importorskip("numpy")
+    cache = PcmCache(str(tmp_path))
+    path = cache.path('a.wav', 'etag-1', 44100, 2)
+    assert cache.get(path, 2) is None
+    cache.store(path, lambda tmp: np.arange(6, dtype='<f4').tofile(tmp))
+    samples = cache.get(path, 2)
+    assert samples.shape == (3, 2)
+    assert samples[:, 1].tolist() == [1.0, 3.0, 5.0]
+
+
+def test_pcm_cache_evicts_least_recently_used(tmp_path):
+    cache = PcmCache(str(tmp_path), max_bytes=10)
+    old, new = cache.path('old', 'e', 1, 1), cache.path('new', 'e', 1, 1)
+    cache.store(old, lambda tmp: open(tmp, 'wb').write(b'x' * 8))
+    os.utime(old, (1, 1))
+    cache.store(new, lambda tmp: open(tmp, 'wb').write(b'x' * 8))
+    assert os.path.exists(new) and not os.path.exists(old)
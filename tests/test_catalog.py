@@ -0,0 +1,87 @@
+"""Catalog building (src.catalog) and incremental registration (worker.register_actions)."""
+import pytest
+
+pytest.importorskip("google.protobuf")
+from src import catalog  # noqa: E402
+
+
+class Broken:
+    def __init__(self, dao):
+        raise ImportError("no module named 'cv2'")
+
+
+def test_undescribable_actions_get_a_bare_entry():
+    entry = catalog.build_catalog({'x.Broken': Broken})['x.Broken']
+    assert entry['label'] == 'Broken' and 'params' not in entry
+
+
+def test_internal_actions_are_not_published():
+    class Internal(Broken):
+        internal = True
+    assert catalog.build_catalog({'x.Internal': Internal}, strict=True) == {}
+
+
+def test_strict_build_names_every_undescribable_action():
+    with pytest.raises(RuntimeError) as e:
+        catalog.build_catalog({'x.Broken': Broken, 'y.Broken': Broken}, strict=True)
+    assert 'x.Broken' in str(e.value) and 'y.Broken' in str(e.value)
+
+
+class FakeS3:
+    def __init__(self, objects):
+        self.objects = set(objects)
+        self.puts = []
+
+    def head_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise FileNotFoundError(Key)
+        return {}
+
+    def put_object(self, Bucket, Key, **kwargs):
+        self.objects.add(Key)
+        self.puts.append(Key)
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """register_actions against an in-memory docstore and bucket, already published once."""
+    boto3 = pytest.importorskip("boto3")
+    dynamo = pytest.importorskip("feaas.dao.docstore.dynamo")
+    worker = pytest.importorskip("src.worker")
+
+    actions_data = {'ffmpeg.probe': {'action_id': 'ffmpeg.probe', 'label': 'Probe'}}
+    docs, s3 = {}, FakeS3([])
+
+    class Docstore:
+        def __init__(self, *args):
+            pass
+
+        def get_document(self, doc_id):
+            return docs.get(doc_id)
+
+        def save_document(self, doc_id, doc):
+            docs[doc_id] = doc
+
+    monkeypatch.setenv('PRIMARY_BUCKET', 'bucket')
+    monkeypatch.setenv('HOSTNAME', 'host')
+    monkeypatch.delenv('REGISTER_ACTIONS_FORCE', raising=False)
+    monkeypatch.delenv('REGISTER_ACTIONS_CRAWL', raising=False)
+    monkeypatch.setattr(boto3, 'client', lambda *args, **kwargs: s3, raising=False)
+    monkeypatch.setattr(dynamo, 'DynamoDocstore', Docstore)
+    monkeypatch.setattr(catalog, 'load_catalog', lambda: actions_data)
+    worker.register_actions()
+    s3.puts.clear()
+    return worker, s3
+
+
+def test_registration_skips_targets_that_are_current(registry):
+    worker, s3 = registry
+    worker.register_actions()
+    assert s3.puts == []
+
+
+def test_registration_republishes_a_deleted_actions_json(registry):
+    worker, s3 = registry
+    s3.objects.discard('sys/actions/plus-worker/actions.json')
+    worker.register_actions()
+    assert s3.puts == ['sys/actions/plus-worker/actions.json']
@@ -0,0 +1,90 @@
+"""Input fetching in src.actions.vendor.ffmpeg.fetch and blob downloads in s3."""
+import os
+import threading
+
+import pytest
+
+from src.actions.vendor.ffmpeg import fetch, s3, workspace
+
+
+@pytest.fixture
+def heads(monkeypatch):
+    """Record HEADs; every object is 100 bytes."""
+    seen = []
+    monkeypatch.setenv('PRIMARY_BUCKET', 'bucket')
+    monkeypatch.setattr(s3, 'head', lambda key: seen.append(key) or {'ContentLength': 100})
+    return seen
+
+
+def downloader(tmp_path, size=100):
+    def download(key):
+        path = tmp_path / key
+        path.write_bytes(b'x' * size)
+        return str(path)
+    return download
+
+
+def test_short_lists_are_fetched_without_heads(heads, tmp_path):
+    keys = [f'{i}.wav' for i in range(4)]
+    paths = fetch.fetch_all(downloader(tmp_path), keys)
+    assert [os.path.basename(p) for p in paths] == keys
+    assert heads == []
+
+
+def test_long_lists_are_refused_before_downloading(heads, monkeypatch, tmp_path):
+    monkeypatch.setattr(fetch, 'FETCH_SIZE_CHECK_KEYS', 3)
+    downloaded = []
+    with pytest.raises(ValueError, match='fetch budget'):
+        fetch.fetch_all(lambda key: downloaded.append(key), ['a', 'b', 'c'], max_bytes=250)
+    assert sorted(heads) == ['a', 'b', 'c'] and downloaded == []
+
+
+def test_short_lists_stop_once_downloads_pass_the_budget(heads, tmp_path):
+    keys = [f'{i}.wav' for i in range(4)]
+    with pytest.raises(ValueError, match='fetch budget'):
+        fetch.fetch_all(downloader(tmp_path), keys, max_parallel=1, max_bytes=250)
+    assert heads == []
+    assert os.listdir(tmp_path) == []
+
+
+def test_streamed_inputs_take_sizes_from_the_downloads(heads, tmp_path):
+    keys = [f'{i}.ts' for i in range(3)]
+    work = tmp_path / 'work'
+    work.mkdir()
+    downloads = tmp_path / 'downloads'
+    downloads.mkdir()
+    received = []
+
+    with workspace.workspace():
+        with fetch.StreamedInputs(downloader(downloads, size=10), keys, str(work), max_bytes=15) as inputs:
+            def read():
+                for path in inputs.paths:
+                    with open(path, 'rb') as f:
+                        received.append(f.read())
+            reader = threading.Thread(target=read)
+            reader.start()
+            reader.join(10)
+    assert received == [b'x' * 10] * 3
+    assert heads == []
+    assert os.listdir(downloads) == [] and os.listdir(work) == []
+
+
+@pytest.mark.parametrize('bucket, direct', [(None, True), ('bucket', False)])
+def test_download_blob_goes_through_the_blobstore_by_default(monkeypatch, tmp_path, bucket, direct):
+    if bucket:
+        monkeypatch.setenv('PRIMARY_BUCKET', bucket)
+    else:
+        monkeypatch.delenv('PRIMARY_BUCKET', raising=False)
+    monkeypatch.setattr(s3, 'DIRECT_READS', direct)
+    monkeypatch.setattr(s3, 'download', lambda key, path: pytest.fail('direct GET'))
+    calls = []
+    blobstore = type('Store', (), {'download_file': lambda self, key, path: calls.append((key, path))})()
+    assert s3.download_blob(blobstore, 'a.mp4', str(tmp_path / 'a.mp4')) is None
+    assert calls == [('a.mp4', str(tmp_path / 'a.mp4'))]
+
+
+def test_direct_reads_get_the_s3_object_with_the_same_key(monkeypatch, tmp_path):
+    monkeypatch.setenv('PRIMARY_BUCKET', 'bucket')
+    monkeypatch.setattr(s3, 'DIRECT_READS', True)
+    monkeypatch.setattr(s3, 'download', lambda key, path: f'etag-of-{key}')
+    assert s3.download_blob(None, 'a/b.mp4', str(tmp_path / 'b.mp4')) == 'etag-of-a/b.mp4'
@@ -0,0 +1,36 @@
+"""The lazy action exports of src.actions.vendor.ffmpeg."""
+import ast
+import os
+
+from src.actions.vendor import ffmpeg
+
+PACKAGE_DIR = os.path.dirname(ffmpeg.__file__)
+
+
+def action_classes() -> dict:
+    """{class name: module name} for every action class defined in the package, found
+    without importing it: subclasses of FFMPEGAction or of another action class."""
+    bases = {}
+    for filename in os.listdir(PACKAGE_DIR):
+        if filename.endswith('.py') and filename != '__init__.py':
+            with open(os.path.join(PACKAGE_DIR, filename)) as f:
+                tree = ast.parse(f.read())
+            for node in tree.body:
+                if isinstance(node, ast.ClassDef):
+                    names = {b.id for b in node.bases if isinstance(b, ast.Name)}
+                    bases[node.name] = (filename[:-3], names)
+    actions = {}
+    changed = True
+    while changed:
+        changed = False
+        for name, (module, names) in bases.items():
+            if name not in actions and names & ({'FFMPEGAction'} | set(actions)):
+                actions[name] = module
+                changed = True
+    return actions
+
+
+def test_every_action_is_exported():
+    assert ffmpeg._MODULES == action_classes()
+    assert sorted(ffmpeg.__all__) == sorted(ffmpeg._MODULES)
+
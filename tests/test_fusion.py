@@ -0,0 +1,220 @@
+"""Chain detection and script rewriting in src.actions.vendor.ffmpeg.fusion."""
+import json
+
+import pytest
+
+objs = pytest.importorskip("feaas.objects")
+fusion = pytest.importorskip("src.actions.vendor.ffmpeg.fusion")
+
+PREFIX = 'plusworker.ffmpeg.'
+
+
+def action(unique_id, key, conditional=None, **inputs):
+    """An ACTION node; `inputs` are configured (unlinked) string params, var_name=sdefault."""
+    node = objs.PlusScriptNode(ntype=objs.PlusScriptNodeType.ACTION, unique_id=unique_id,
+                               label=unique_id, action_id=PREFIX + key)
+    media_param = fusion.FUSABLE_ACTIONS[key][1] if key in fusion.FUSABLE_ACTIONS else 'file'
+    node.inputs.append(objs.Parameter(var_name=media_param, ptype=objs.ParameterType.STRING))
+    for var_name, value in inputs.items():
+        node.inputs.append(objs.Parameter(var_name=var_name, ptype=objs.ParameterType.STRING, sdefault=value))
+    node.outputs.append(objs.Parameter(var_name='file'))
+    if conditional:
+        node.conditional.source = conditional
+    return node
+
+
+def static(unique_id, sval):
+    return objs.PlusScriptNode(ntype=objs.PlusScriptNodeType.STATIC, unique_id=unique_id,
+                               value=objs.AnyType(ptype=objs.ParameterType.STRING, sval=sval))
+
+
+def script(nodes, links):
+    s = objs.PlusScript()
+    s.nodes.extend(nodes)
+    for source, source_handle, target, target_handle in links:
+        s.links.append(objs.PlusScript.Link(source=source, sourceHandle=source_handle,
+                                            target=target, targetHandle=target_handle))
+    return s
+
+
+def chain_ids(s):
+    return [[n.unique_id for n in chain] for chain in fusion.find_ffmpeg_chains(s)]
+
+
+def linear(*keys):
+    """input -> keys[0] -> keys[1] -> ... -> output, each hand-off through `file`."""
+    nodes = [static('input', 'in.mp4')] + [action(f'n{i}', key) for i, key in enumerate(keys)]
+    links = [('input', 'value', 'n0', fusion.FUSABLE_ACTIONS[keys[0]][1])]
+    for i in range(1, len(keys)):
+        links.append((f'n{i - 1}', 'file', f'n{i}', fusion.FUSABLE_ACTIONS[keys[i]][1]))
+    return nodes, links
+
+
+def test_linear_chain_is_found():
+    nodes, links = linear('trim.Trim', 'resize.Resize', 'compress.Compress')
+    assert chain_ids(script(nodes, links)) == [['n0', 'n1', 'n2']]
+
+
+def test_single_node_is_not_a_chain():
+    nodes, links = linear('compress.Compress')
+    assert chain_ids(script(nodes, links)) == []
+
+
+def test_unfusable_action_breaks_the_chain():
+    nodes, links = linear('trim.Trim', 'resize.Resize')
+    nodes.append(action('probe', 'probe.Probe'))
+    nodes.append(action('n2', 'compress.Compress'))
+    links += [('n1', 'file', 'probe', 'file'), ('probe', 'file', 'n2', 'file')]
+    # n1 now feeds Probe, which isn't fusable, so only n0 -> n1 fuses
+    assert chain_ids(script(nodes, links)) == [['n0', 'n1']]
+
+
+def test_output_used_twice_is_left_alone():
+    nodes, links = linear('trim.Trim', 'resize.Resize')
+    nodes.append(action('n2', 'compress.Compress'))
+    links.append(('n0', 'file', 'n2', 'file'))
+    assert chain_ids(script(nodes, links)) == []
+
+
+def test_hand_off_into_a_non_media_input_is_left_alone():
+    nodes = [static('input', 'in.mp4'), action('n0', 'trim.Trim'), action('n1', 'overlay.Overlay'),
+             static('video', 'other.mp4')]
+    links = [('input', 'value', 'n0', 'file'), ('n0', 'file', 'n1', 'image_file'),
+             ('video', 'value', 'n1', 'video_file')]
+    assert chain_ids(script(nodes, links)) == []
+
+
+def test_conditional_nodes_are_left_alone():
+    nodes, links = linear('trim.Trim', 'resize.Resize', 'compress.Compress')
+    nodes[2] = action('n1', 'resize.Resize', conditional='flag')
+    assert chain_ids(script(nodes, links)) == []
+
+
+def test_convert_ends_a_chain():
+    nodes, links = linear('trim.Trim', 'convert.Convert', 'resize.Resize', 'compress.Compress')
+    assert chain_ids(script(nodes, links)) == [['n0', 'n1'], ['n2', 'n3']]
+
+
+def test_second_trim_starts_a_new_chain():
+    nodes, links = linear('trim.Trim', 'resize.Resize', 'trim.Trim', 'compress.Compress')
+    assert chain_ids(script(nodes, links)) == [['n0', 'n1'], ['n2', 'n3']]
+
+
+def fused_example():
+    nodes, links = linear('trim.Trim', 'resize.Resize', 'compress.Compress')
+    nodes += [static('width', '640'), static('quality', 'high'), action('after', 'probe.Probe')]
+    links += [('width', 'value', 'n1', 'width'), ('quality', 'value', 'n2', 'quality'),
+              ('n2', 'file', 'after', 'file')]
+    return script(nodes, links)
+
+
+def test_fuse_leaves_the_input_script_unchanged():
+    original = fused_example()
+    before = original.SerializeToString()
+    fused, chains = fusion.fuse_ffmpeg_chains(original)
+    assert original.SerializeToString() == before
+    assert fused is not original
+    assert len(chains) == 1
+
+
+def test_fuse_maps_stage_params_and_links():
+    fused, _ = fusion.fuse_ffmpeg_chains(fused_example())
+    ids = [n.unique_id for n in fused.nodes]
+    assert 'n0' not in ids and 'n1' not in ids and 'n2' not in ids
+    assert set(ids) == {'input', 'width', 'quality', 'after', 'fused-n0'}
+
+    links = {(l.source, l.sourceHandle, l.target, l.targetHandle) for l in fused.links}
+    assert ('input', 'value', 'fused-n0', 'file') in links
+    assert ('width', 'value', 'fused-n0', 's1__width') in links
+    assert ('quality', 'value', 'fused-n0', 's2__quality') in links
+    assert ('fused-n0', 'file', 'after', 'file') in links
+    assert not any(l[3] == 'stages' for l in links)  # the specs travel as the input's default
+
+    node = next(n for n in fused.nodes if n.unique_id == 'fused-n0')
+    assert node.action_id == PREFIX + fusion.FUSED_ACTION
+    assert {p.var_name for p in node.inputs} == {'file', 'stages', 's1__width', 's2__quality'}
+    stages = json.loads(next(p.sdefault for p in node.inputs if p.var_name == 'stages'))
+    assert [s['action'] for s in stages] == ['trim.Trim', 'resize.Resize', 'compress.Compress']
+
+
+def test_nothing_to_fuse_returns_the_same_script():
+    s = script(*linear('compress.Compress'))
+    assert fusion.fuse_ffmpeg_chains(s) == (s, [])
+
+
+def test_fused_chain_routes_prefixed_params_to_their_stage(monkeypatch):
+    seen = {}
+    monkeypatch.setattr(fusion.FusedChain, '_run_fused',
+                        lambda self, file, stages: seen.setdefault('stages', stages))
+    stages = json.dumps([{'action': 'trim.Trim'}, {'action': 'resize.Resize'}, {'action': 'compress.Compress'}])
+    fusion.FusedChain(None).execute_action('a/in.mp4', stages, s0__start_time='5', s1__width=640,
+                                           s2__quality='high', s9__ignored=1, unrelated=2)
+    trim, resize, compress = seen['stages']
+    assert trim.input_args == ['-ss', '5']
+    assert resize.suffix and any('640' in f for f in resize.video_filters)
+    assert compress.video_codec_args[:4] == ['-c:v', 'libx264', '-crf', '20']
+
+
+def test_fused_args_run_every_stage_in_one_command():
+    stages = [fusion.Trim(None).fusion_stage(start_time='1', duration='2'),
+              fusion.Resize(None).fusion_stage(file='a.mp4', width=640, height=360)]
+    args = fusion.FusedChain._fused_args('in.mp4', stages, [[], []], 'out.mp4')
+    assert args[:4] == ['-ss', '1', '-i', 'in.mp4']
+    assert args.count('-i') == 1
+    assert args[args.index('-filter_complex') + 1].startswith('[0:v]')
+    assert args[-3:] == ['-t', '2', 'out.mp4']
+
+
+def test_configured_unlinked_params_are_carried_over():
+    nodes = [static('input', 'in.mp4'), action('n0', 'trim.Trim', start_time='5', duration='10'),
+             action('n1', 'resize.Resize', width='640')]
+    links = [('input', 'value', 'n0', 'file'), ('n0', 'file', 'n1', 'file')]
+    fused, _ = fusion.fuse_ffmpeg_chains(script(nodes, links))
+    node = next(n for n in fused.nodes if n.unique_id == 'fused-n0')
+    inputs = {p.var_name: p.sdefault for p in node.inputs}
+    assert inputs['s0__start_time'] == '5' and inputs['s0__duration'] == '10'
+    assert inputs['s1__width'] == '640'
+    # media inputs: the head's becomes `file`, later ones are the in-graph hand-off
+    assert 'file' in inputs and 's0__file' not in inputs and 's1__file' not in inputs
+
+
+def test_linked_param_is_not_duplicated():
+    nodes = [static('input', 'in.mp4'), action('n0', 'trim.Trim'), action('n1', 'resize.Resize', width='320'),
+             static('width', '640')]
+    links = [('input', 'value', 'n0', 'file'), ('n0', 'file', 'n1', 'file'), ('width', 'value', 'n1', 'width')]
+    fused, _ = fusion.fuse_ffmpeg_chains(script(nodes, links))
+    node = next(n for n in fused.nodes if n.unique_id == 'fused-n0')
+    assert [p.var_name for p in node.inputs].count('s1__width') == 1
+
+
+def test_fused_chain_is_not_published():
+    assert fusion.FusedChain.internal
+
+
+def test_whole_chain_runs_in_one_invocation(monkeypatch, tmp_path):
+    source = tmp_path / 'in.mp4'
+    source.write_bytes(b'x' * 1000)
+    commands = []
+
+    def run_ffmpeg(self, args, check=True, threads=None, progress=None):
+        commands.append(args)
+        with open(args[-1], 'wb') as f:
+            f.write(b'x' * 100)
+        return type('Proc', (), {'returncode': 0, 'stderr': ''})()
+
+    uploads = []
+    monkeypatch.setattr(fusion.FusedChain, 'download_file', lambda self, key: str(source))
+    monkeypatch.setattr(fusion.FusedChain, 'cleanup', lambda self, *paths: None)
+    monkeypatch.setattr(fusion.FusedChain, 'run_ffmpeg', run_ffmpeg)
+    monkeypatch.setattr(fusion.FusedChain, 'upload_file', lambda self, path, key: uploads.append(key))
+
+    stages = json.dumps([{'action': 'trim.Trim'}, {'action': 'resize.Resize'}, {'action': 'compress.Compress'}])
+    receipt = fusion.FusedChain(None).execute_action('a/in.mp4', stages, s0__start_time='5',
+                                                     s1__width=640, s1__height=360)
+    assert receipt.success, receipt.error_message
+    assert len(commands) == 1
+    assert commands[0].count('-c:v') == 1
+    # measured against the chain's input
+    assert receipt.outputs['size_reduction'].dval == 90.0
+    assert uploads == [receipt.outputs['file'].sval]
+    assert uploads[0].startswith('a/in_trimmed_') and uploads[0].endswith('_compressed.mp4')
@@ -0,0 +1,49 @@
+"""Parsing `python -X importtime` output in src.import_report."""
+import subprocess
+import sys
+
+from src import import_report
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:        80 |        200 | io
+import time:        50 |         50 |     posixpath
+import time:       300 |        350 |   os
+import time:      1000 |       1350 | src.worker
+some unrelated stderr line
+import time:        40 |         40 | json
+"""
+
+
+def test_parse_importtime_reads_every_entry():
+    entries = import_report.parse_importtime(SAMPLE)
+    assert [e['module'] for e in entries] == ['_io', 'io', 'posixpath', 'os', 'src.worker', 'json']
+    assert entries[0] == {'module': '_io', 'self_us': 120, 'cumulative_us': 120, 'depth': 1}
+    assert [e['depth'] for e in entries] == [1, 0, 2, 1, 0, 0]
+
+
+def test_total_counts_only_top_level_imports():
+    assert import_report.total_us(import_report.parse_importtime(SAMPLE)) == 200 + 1350 + 40
+
+
+def test_parse_ignores_the_header_and_other_output():
+    assert import_report.parse_importtime("import time: self [us] | cumulative | imported package\n"
+                                          "Traceback (most recent call last):\n") == []
+
+
+def test_parse_real_importtime_output():
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import json'],
+                            capture_output=True, text=True, check=True)
+    entries = import_report.parse_importtime(result.stderr)
+    assert 'json' in [e['module'] for e in entries if e['depth'] == 0]
+    assert import_report.total_us(entries) >= next(e['cumulative_us'] for e in entries if e['module'] == 'json')
+
+
+def test_format_report_lists_the_slowest_modules():
+    entries = import_report.parse_importtime(SAMPLE)
+    report = {'run_mode': 'RUN_ACTION', 'wall_s': 0.5, 'import_us': import_report.total_us(entries),
+              'modules': [e['module'] for e in entries], 'entries': entries}
+    lines = import_report.format_report(report, top=2).splitlines()
+    assert lines[0].startswith('Import report for RUN_ACTION: 2 ms importing 6 modules')
+    assert [line.split()[-1] for line in lines[1:]] == ['src.worker', 'os']
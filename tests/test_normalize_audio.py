@@ -0,0 +1,115 @@
+"""NormalizeAudio's measurement cache and BatchNormalizeAudio."""
+import threading
+
+import pytest
+
+pytest.importorskip("feaas.objects")
+normalize_audio = pytest.importorskip("src.actions.vendor.ffmpeg.normalize_audio")
+
+NormalizeAudio = normalize_audio.NormalizeAudio
+BatchNormalizeAudio = normalize_audio.BatchNormalizeAudio
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = normalize_audio.ProbeCache()
+    monkeypatch.setattr(normalize_audio, 'MEASUREMENT_CACHE', cache)
+    return cache
+
+
+def fake_rms(monkeypatch, etags, levels, measured):
+    def pcm(self, key, sample_rate=44100, channels=1, local_path=None, threads=None):
+        measured.append((key, threads))
+        return levels[key]
+
+    monkeypatch.setattr(NormalizeAudio, 'etag', lambda self, key: etags.get(key))
+    monkeypatch.setattr(NormalizeAudio, 'probe', lambda self, key, local_path=None: {'streams': []})
+    monkeypatch.setattr(NormalizeAudio, 'pcm', pcm)
+
+
+def test_measurements_are_cached_per_etag(monkeypatch, cache):
+    np = pytest.importorskip("numpy")
+    etags, measured = {'a.wav': 'v1'}, []
+    fake_rms(monkeypatch, etags, {'a.wav': np.full((10, 1), 0.5, dtype=np.float32)}, measured)
+    action = NormalizeAudio.__new__(NormalizeAudio)
+
+    action.measure('a.wav', 'local', -16.0, 'rms')
+    action.measure('a.wav', 'local', -16.0, 'rms')
+    assert len(measured) == 1
+    action.measure('a.wav', 'local', -20.0, 'rms')
+    etags['a.wav'] = 'v2'
+    action.measure('a.wav', 'local', -16.0, 'rms')
+    assert len(measured) == 3
+
+    etags.clear()
+    action.measure('a.wav', 'local', -16.0, 'rms')
+    action.measure('a.wav', 'local', -16.0, 'rms')
+    assert len(measured) == 5
+
+
+def test_rms_entries_of_an_older_format_are_remeasured(monkeypatch, cache):
+    np = pytest.importorskip("numpy")
+    measured = []
+    fake_rms(monkeypatch, {'a.wav': 'v1'}, {'a.wav': np.full((10, 1), 0.5, dtype=np.float32)}, measured)
+    cache.put('a.wav', 'v1#rms@-16.0', {'mean_volume': -99.0})
+    action = NormalizeAudio.__new__(NormalizeAudio)
+    assert action.measure('a.wav', 'local', -16.0, 'rms')['mean_volume'] != -99.0
+    assert len(measured) == 1
+
+
+def test_upload_drops_measurements_of_the_key(monkeypatch, cache):
+    cache.put('a.wav', 'v1#rms@-16.0', {'mean_volume': -20.0, 'channels': 1})
+    cache.put('b.wav', 'v1#rms@-16.0', {'mean_volume': -20.0, 'channels': 1})
+    monkeypatch.setattr(normalize_audio.FFMPEGAction, 'upload_file', lambda self, path, key: key)
+    NormalizeAudio.__new__(NormalizeAudio).upload_file('/tmp/a.wav', 'a.wav')
+    assert cache.get('a.wav', 'v1#rms@-16.0') is None
+    assert cache.get('b.wav', 'v1#rms@-16.0') is not None
+
+
+def test_shared_gain_is_limited_only_when_it_boosts():
+    assert normalize_audio.shared_gain_filter(-3.0) == "volume=-3.00dB"
+    boost = normalize_audio.shared_gain_filter(4.5)
+    assert boost.startswith("volume=4.50dB,alimiter=limit=0.8414:")
+    assert "level=disabled" in boost
+
+
+@pytest.mark.parametrize('shared_gain', [False, True])
+def test_batch_keeps_at_most_max_parallel_inputs_on_disk(monkeypatch, cache, shared_gain):
+    np = pytest.importorskip("numpy")
+    files = [f'album/{i}.wav' for i in range(8)]
+    levels = {f: np.full((10, 1), 0.1 * (i + 1), dtype=np.float32) for i, f in enumerate(files)}
+    measured, filters, threads_seen = [], {}, set()
+    fake_rms(monkeypatch, {}, levels, measured)
+    on_disk, peak, lock = set(), [0], threading.Lock()
+
+    def download_file(self, key):
+        with lock:
+            on_disk.add(key)
+            peak[0] = max(peak[0], len(on_disk))
+        return key
+
+    def cleanup(self, *paths):
+        with lock:
+            on_disk.difference_update(p for p in paths if p)
+
+    def normalize(self, file, local_input, audio_filter, threads=None):
+        threads_seen.add(threads)
+        filters[file] = audio_filter
+        return file + '.out'
+
+    monkeypatch.setattr(BatchNormalizeAudio, 'download_file', download_file)
+    monkeypatch.setattr(BatchNormalizeAudio, 'cleanup', cleanup)
+    monkeypatch.setattr(BatchNormalizeAudio, 'normalize', normalize)
+    action = BatchNormalizeAudio.__new__(BatchNormalizeAudio)
+    action.blobstore = type('Store', (), {'ls': lambda self, prefix, delim: files})()
+
+    receipt = action.execute_action('album', -16.0, 'rms', shared_gain=shared_gain, max_parallel=2)
+    assert receipt.success, receipt.error_message
+    assert len(receipt.outputs['files'].svals) == 8
+    assert peak[0] <= 2 and not on_disk
+    assert threads_seen == {normalize_audio.THREAD_BUDGET.share(2)}
+    assert {t for _, t in measured} == threads_seen
+    if shared_gain:
+        assert len(set(filters.values())) == 1
+    else:
+        assert len(set(filters.values())) == 8
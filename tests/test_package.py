@@ -0,0 +1,96 @@
+"""PackageStream's upload-while-encoding in src.actions.vendor.ffmpeg.package."""
+import os
+import subprocess
+import threading
+
+import pytest
+
+pytest.importorskip("feaas.objects")
+package = pytest.importorskip("src.actions.vendor.ffmpeg.package")
+from src.actions.vendor.ffmpeg import workspace
+
+PackageStream = package.PackageStream
+
+
+class Uploads:
+    def __init__(self):
+        self.keys = []
+        self.first = threading.Event()
+
+
+@pytest.fixture
+def uploads(monkeypatch, tmp_path):
+    monkeypatch.setattr(workspace, 'WORKSPACE_ROOT', str(tmp_path / 'ws'))
+    monkeypatch.setattr(package, 'POLL_SECONDS', 0.01)
+    uploaded = Uploads()
+
+    def upload_file(self, local_path, dest_key):
+        assert workspace.current() is not None
+        assert os.path.exists(local_path)
+        uploaded.keys.append(dest_key)
+        uploaded.first.set()
+        return dest_key
+
+    def download_file(self, key):
+        path = os.path.join(self.scratch_dir, 'in.mp4')
+        open(path, 'wb').close()
+        return path
+
+    monkeypatch.setattr(PackageStream, 'upload_file', upload_file)
+    monkeypatch.setattr(PackageStream, 'download_file', download_file)
+    monkeypatch.setattr(PackageStream, 'probe', lambda self, key, local_path=None: {'streams': []})
+    return uploaded
+
+
+def write(out_dir, *names):
+    for name in names:
+        path = os.path.join(out_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(name)
+
+
+def run(renditions=('480p',)):
+    action = PackageStream.__new__(PackageStream)
+    return action.execute_action('media/clip.mp4', 'hls', list(renditions), 2, 'out/')
+
+
+def test_segments_upload_while_encoding_and_manifests_last(monkeypatch, uploads):
+    def run_ffmpeg(self, args, **kwargs):
+        out_dir = os.path.join(self.scratch_dir, 'hls')
+        write(out_dir, 'v0/seg_00000.ts', 'v0/seg_00001.ts')
+        # seg_00000 is finished (seg_00001 follows it) and goes up before ffmpeg exits
+        assert uploads.first.wait(5)
+        assert uploads.keys == ['out/v0/seg_00000.ts']
+        write(out_dir, 'v0/seg_00002.ts', 'v0/index.m3u8', 'master.m3u8')
+
+    monkeypatch.setattr(PackageStream, 'run_ffmpeg', run_ffmpeg)
+    receipt = run()
+    assert receipt.success, receipt.error_message
+    assert receipt.outputs['segments'].ival == 3
+    assert receipt.outputs['manifest'].sval == 'out/master.m3u8'
+    # The last segment is only flushed once ffmpeg exits, then the playlists
+    assert sorted(uploads.keys[1:3]) == ['out/v0/seg_00001.ts', 'out/v0/seg_00002.ts']
+    assert uploads.keys[3:] == ['out/v0/index.m3u8', 'out/master.m3u8']
+
+
+def test_finished_segments_need_a_successor_in_their_rendition(tmp_path):
+    write(str(tmp_path), 'v0/seg_00000.ts', 'v0/seg_00001.ts', 'v1/seg_00000.ts',
+          'v1/seg_00001.ts.tmp', 'v0/index.m3u8')
+    action = PackageStream.__new__(PackageStream)
+    assert action._finished_segments(str(tmp_path)) == [os.path.join('v0', 'seg_00000.ts')]
+
+
+def test_failed_encode_publishes_no_manifest(monkeypatch, uploads, tmp_path):
+    def run_ffmpeg(self, args, **kwargs):
+        out_dir = os.path.join(self.scratch_dir, 'hls')
+        write(out_dir, 'v0/seg_00000.ts', 'v0/seg_00001.ts')
+        assert uploads.first.wait(5)
+        write(out_dir, 'v0/index.m3u8', 'master.m3u8')
+        raise subprocess.CalledProcessError(1, ['ffmpeg'], stderr='encoder error')
+
+    monkeypatch.setattr(PackageStream, 'run_ffmpeg', run_ffmpeg)
+    receipt = run()
+    assert not receipt.success
+    assert uploads.keys == ['out/v0/seg_00000.ts']
+    assert os.listdir(tmp_path / 'ws') == []
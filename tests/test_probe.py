@@ -0,0 +1,34 @@
+"""BatchProbe's handling of its own outputs in src.actions.vendor.ffmpeg.probe."""
+import pytest
+
+pytest.importorskip("feaas.objects")
+probe = pytest.importorskip("src.actions.vendor.ffmpeg.probe")
+
+
+def test_earlier_outputs_are_not_probed():
+    src, dest = 'media/', 'media/probe/'
+    assert probe._is_batch_probe_output('media/probe/probe_results.parquet', src, dest)
+    assert probe._is_batch_probe_output('media/probe/notes.txt', src, dest)
+    assert probe._is_batch_probe_output('media/old/probe_receipts.jsonl', src, dest)
+    assert not probe._is_batch_probe_output('media/clip.mp4', src, dest)
+    assert not probe._is_batch_probe_output('media/probes/clip.mp4', src, dest)
+
+
+def test_dest_equal_to_src_still_probes_the_folder():
+    assert not probe._is_batch_probe_output('media/clip.mp4', 'media/', 'media/')
+    assert probe._is_batch_probe_output('media/probe_results.parquet', 'media/', 'media/')
+
+
+def test_dest_outside_src_only_skips_output_names():
+    assert not probe._is_batch_probe_output('media/clip.mp4', 'media/', 'reports/')
+
+
+def test_probe_remote_heads_only_files_without_an_etag(monkeypatch):
+    heads = []
+    monkeypatch.setattr(probe.s3, 'etag', lambda key: heads.append(key) or f'etag-{key}')
+    monkeypatch.setattr(probe.PROBE_CACHE, 'get', lambda key, etag: {'format': {'size': '7'}})
+    action = probe.BatchProbe.__new__(probe.BatchProbe)
+    row = action._probe_remote('media/a.mp4', None, None)
+    assert row['etag'] == 'etag-media/a.mp4' and row['size_bytes'] == 7 and row['error'] is None
+    assert action._probe_remote('media/b.mp4', 'listed', 3)['etag'] == 'listed'
+    assert heads == ['media/a.mp4']
@@ -0,0 +1,54 @@
+"""ffmpeg subprocess supervision (process.run_with_progress) and cancellation."""
+import time
+
+import pytest
+
+from src import progress
+from src.actions.vendor.ffmpeg import process
+
+# Runs `sleep` in place of ffmpeg: the prefix swallows the ffmpeg command line
+SLEEP = ['sh', '-c', 'exec sleep 1.5', '--']
+
+
+@pytest.fixture(autouse=True)
+def quick_stall(monkeypatch):
+    monkeypatch.setattr(process, 'STALL_TIMEOUT_SECONDS', 0.5)
+    monkeypatch.setattr(process, 'POLL_SECONDS', 0.1)
+
+
+def test_silent_process_is_killed_as_stalled():
+    started = time.monotonic()
+    with pytest.raises(process.FFMPEGStalledError):
+        process.run_with_progress(['-i', 'x', 'y'], prefix=SLEEP)
+    assert time.monotonic() - started < 1.4
+
+
+def test_outside_activity_holds_off_the_stall_timeout():
+    result = process.run_with_progress(['-i', 'x', 'y'], prefix=SLEEP, activity=time.monotonic)
+    assert result.returncode == 0
+
+
+def test_undecodable_stderr_is_replaced_not_fatal():
+    # ffmpeg echoes metadata and file names as raw bytes, which needn't be UTF-8
+    noisy = ['sh', '-c', r"printf 'title: \377\376 clip\n' >&2; exit 1", '--']
+    result = process.run_with_progress(['-i', 'x', 'y'], prefix=noisy, check=False)
+    assert result.returncode == 1
+    assert result.stderr == 'title: \ufffd\ufffd clip\n'
+
+
+def test_cancellation_is_not_an_ordinary_error():
+    def action():
+        try:
+            progress.report(0.5)
+        except Exception:
+            return 'failure receipt'
+
+    def cancel(fraction):
+        raise progress.Cancelled()
+
+    progress.set_listener(cancel)
+    try:
+        with pytest.raises(progress.Cancelled):
+            action()
+    finally:
+        progress.set_listener(None)
@@ -0,0 +1,87 @@
+"""BatchResizeImage in src.actions.vendor.ffmpeg.resize."""
+import pytest
+
+pytest.importorskip("feaas.objects")
+resize = pytest.importorskip("src.actions.vendor.ffmpeg.resize")
+
+
+def test_earlier_outputs_are_skipped():
+    keys = ['a/cat.jpg', 'a/cat_r0.5.png', 'a/cat_r2.jpg', 'a/dog.heic', 'a/car_r1.jpg']
+    # car_r1.jpg has no car.* source next to it, so it's an image in its own right
+    assert resize.skip_resized_outputs(keys) == ['a/cat.jpg', 'a/dog.heic', 'a/car_r1.jpg']
+
+
+def test_heic_is_an_image():
+    assert '.heic' in resize.IMAGE_EXTS
+
+
+def test_each_image_is_handled_on_its_own(monkeypatch, tmp_path):
+    sources = {'a/one.jpg': b'1', 'a/bad.jpg': b'', 'a/two.png': b'2'}
+    on_disk, uploads, contexts = set(), [], []
+
+    def download_file(self, key):
+        path = tmp_path / key.replace('/', '_')
+        path.write_bytes(sources[key])
+        on_disk.add(str(path))
+        return str(path)
+
+    def cleanup(self, *paths):
+        for path in paths:
+            on_disk.discard(path)
+
+    def resize_image(src_path, dst_path, scalar=None, width=None, height=None):
+        if not open(src_path, 'rb').read():
+            raise ValueError('cannot identify image file')
+        open(dst_path, 'wb').close()
+
+    class Pool:
+        def __init__(self, max_workers=None, mp_context=None):
+            contexts.append(mp_context.get_start_method())
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def submit(self, fn, *args):
+            from concurrent.futures import Future
+            future = Future()
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+    monkeypatch.setattr(resize, 'ProcessPoolExecutor', Pool)
+    monkeypatch.setattr(resize.images, 'resize_image', resize_image)
+    monkeypatch.setattr(resize.images, 'supports', lambda src_ext, out_ext: True)
+    monkeypatch.setattr(resize.BatchResizeImage, 'download_file', download_file)
+    monkeypatch.setattr(resize.BatchResizeImage, 'cleanup', cleanup)
+    monkeypatch.setattr(resize.BatchResizeImage, 'upload_file', lambda self, path, key: uploads.append(key) or key)
+
+    action = resize.BatchResizeImage.__new__(resize.BatchResizeImage)
+    receipt = action.execute_action(0.5, 'jpg', files=list(sources))
+    assert receipt.success, receipt.error_message
+    assert sorted(receipt.outputs['files'].svals) == ['a/one_r0.5.jpg', 'a/two_r0.5.jpg']
+    assert receipt.outputs['failed'].ival == 1
+    assert not on_disk
+    assert contexts == ['spawn']
+
+
+@pytest.mark.parametrize('renditions', ['480p, 720p,1920', ['480p', '720p', 1920], ('480p', '720p', '1920')])
+def test_renditions_accept_a_list_or_a_comma_separated_string(monkeypatch, renditions):
+    def download_file(self, key):
+        raise RuntimeError('sizes parsed')
+
+    monkeypatch.setattr(resize.Resize, 'download_file', download_file)
+    monkeypatch.setattr(resize.Resize, 'cleanup', lambda self, *paths: None)
+    action = resize.Resize.__new__(resize.Resize)
+    receipt = action.execute_action(file='a/clip.mp4', renditions=renditions)
+    assert receipt.error_message == 'sizes parsed'
+
+
+def test_renditions_reject_a_non_list():
+    action = resize.Resize.__new__(resize.Resize)
+    receipt = action.execute_action(file='a/clip.mp4', renditions=720)
+    assert not receipt.success and 'must be a list' in receipt.error_message
@@ -0,0 +1,91 @@
+"""Thread budgeting for ffmpeg subprocesses (scheduler.ThreadBudget, FFMPEGAction.run_ffmpeg)."""
+import threading
+
+import pytest
+
+from src.actions.vendor.ffmpeg import scheduler
+from src.actions.vendor.ffmpeg.scheduler import ThreadBudget
+
+
+def test_default_reservation_on_an_idle_budget_is_all_of_it():
+    budget = ThreadBudget(8, max_concurrent=2)
+    with budget.reserve() as only:
+        assert only == 8 and budget.available == 0
+    assert budget.available == 8 and budget.active == 0
+
+
+def test_default_reservation_alongside_another_is_a_fair_share():
+    budget = ThreadBudget(8, max_concurrent=2)
+    with budget.reserve(4):
+        with budget.reserve() as second:
+            assert second == 4
+            assert budget.available == 0
+    assert budget.available == 8
+
+
+def test_waiting_default_reservation_takes_everything_once_idle():
+    budget = ThreadBudget(4, max_concurrent=2)
+    got = []
+    with budget.reserve(4):
+        waiter = threading.Thread(target=lambda: got.append(budget.reserve().__enter__()))
+        waiter.start()
+        waiter.join(0.1)
+        assert waiter.is_alive()
+    waiter.join(1)
+    assert got == [4]
+
+
+def test_explicit_reservations_queue_when_the_budget_is_spent():
+    budget = ThreadBudget(4, max_concurrent=1)
+    got = []
+    with budget.reserve(3):
+        waiter = threading.Thread(target=lambda: got.append(budget.reserve(2).__enter__()))
+        waiter.start()
+        waiter.join(0.1)
+        assert waiter.is_alive() and got == []
+    waiter.join(1)
+    assert got == [2]
+
+
+def test_share_never_drops_below_one_thread():
+    assert ThreadBudget(2).share(8) == 1
+    assert ThreadBudget(8).share(3) == 2
+
+
+@pytest.mark.parametrize('env, expected', [
+    ({}, []),
+    ({'FFMPEG_NICE': '10'}, ['nice', '-n', '10']),
+    ({'FFMPEG_NICE': '5', 'FFMPEG_IONICE_CLASS': '3'}, ['nice', '-n', '5', 'ionice', '-c', '3']),
+])
+def test_priority_prefix(monkeypatch, env, expected):
+    monkeypatch.delenv('FFMPEG_NICE', raising=False)
+    monkeypatch.delenv('FFMPEG_IONICE_CLASS', raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.setattr(scheduler.shutil, 'which', lambda tool: f'/usr/bin/{tool}')
+    assert scheduler.priority_prefix() == expected
+
+
+base = pytest.importorskip("src.actions.vendor.ffmpeg.base")
+
+
+@pytest.mark.parametrize('args, expected', [
+    (["-i", "in.mp4", "-c:v", "libx264", "out.mp4"], [4]),
+    (["-i", "in.mp4", "-an", "-f", "null", "-"], [5]),
+    (["-i", "in.mp4", "-filter_complex", "[0:v]split=2[a][b]", "-map", "[a]", "a.mp4",
+      "-map", "[b]", "-vn", "-frames:v", "1", "b.png"], [6, 12]),
+])
+def test_output_positions(args, expected):
+    assert base.output_positions(args) == expected
+
+
+def test_every_output_gets_a_thread_count(monkeypatch):
+    seen = []
+    monkeypatch.setattr(base, 'THREAD_BUDGET', ThreadBudget(6, max_concurrent=2))
+    monkeypatch.setattr(base, 'run_with_progress', lambda args, **kw: seen.append(args))
+    action = base.FFMPEGAction.__new__(base.FFMPEGAction)
+    action.run_ffmpeg(["-i", "in.mp4", "-map", "0:v", "a.mp4", "-map", "0:v", "b.mp4"], threads=3, progress=False)
+    args = seen[0]
+    assert args[:5] == ["-y", "-filter_threads", "3", "-filter_complex_threads", "3"]
+    assert args[5:] == ["-i", "in.mp4", "-map", "0:v", "-threads", "3", "a.mp4",
+                        "-map", "0:v", "-threads", "3", "b.mp4"]
@@ -0,0 +1,43 @@
+"""Segmented transcoding (FFMPEGAction.transcode_segmented) as used by Convert."""
+import os
+
+import pytest
+
+pytest.importorskip("feaas.objects")
+convert = pytest.importorskip("src.actions.vendor.ffmpeg.convert")
+
+
+def test_muxer_flags_go_on_the_final_mux_only(monkeypatch, tmp_path):
+    commands = []
+    listed = []
+
+    def run_ffmpeg(self, args, check=True, threads=None, progress=None):
+        commands.append(args)
+        if "concat" in args:
+            with open(args[args.index('-i') + 1]) as f:
+                listed.extend(os.path.basename(line.split("'")[1]) for line in f)
+        if "segment" in args:
+            for i in range(3):
+                open(args[-1].replace('%05d', f'{i:05d}'), 'wb').close()
+        else:
+            open(args[-1], 'wb').close()
+
+    monkeypatch.setattr(convert.Convert, 'run_ffmpeg', run_ffmpeg)
+    monkeypatch.setattr(convert.Convert, 'scratch_dir', str(tmp_path))
+    action = convert.Convert(None)
+    video_args, audio_args = convert.VIDEO_CODECS['mp4']
+    action.transcode_segmented('in.mov', str(tmp_path / 'out.mp4'), list(video_args), list(audio_args),
+                               10, max_parallel=2, mux_args=convert.MUXER_ARGS['mp4'])
+
+    split, *encodes, concat, mux = commands
+    assert len(encodes) == 3
+    assert all('-movflags' not in args and args[-1].endswith('.mkv') for args in encodes)
+    assert '-movflags' not in concat
+    assert mux[-3:] == ['-movflags', '+faststart', str(tmp_path / 'out.mp4')]
+    # Chunks are concatenated in source order whatever order they finish in
+    assert listed == ['enc_00000.mkv', 'enc_00001.mkv', 'enc_00002.mkv']
+
+
+def test_standalone_mp4_keeps_faststart():
+    args = convert.Convert(None)._codec_args('mp4')
+    assert args[-2:] == ['-movflags', '+faststart']
@@ -0,0 +1,71 @@
+"""Thumbnails' sprite-sheet mode in src.actions.vendor.ffmpeg.thumbnails."""
+import json
+import os
+
+import pytest
+
+pytest.importorskip("feaas.objects")
+thumbnails = pytest.importorskip("src.actions.vendor.ffmpeg.thumbnails")
+from src.actions.vendor.ffmpeg import workspace
+
+Thumbnails = thumbnails.Thumbnails
+
+
+@pytest.mark.parametrize('video, expected', [
+    ({'width': 1920, 'height': 1080}, (1920, 1080)),
+    ({'width': 1920, 'height': 1080, 'tags': {'rotate': '90'}}, (1080, 1920)),
+    ({'width': 1920, 'height': 1080, 'side_data_list': [{'rotation': -90}]}, (1080, 1920)),
+    ({'width': 1920, 'height': 1080, 'side_data_list': [{'rotation': 180}]}, (1920, 1080)),
+    ({'width': 1440, 'height': 1080, 'sample_aspect_ratio': '4:3'}, (1920, 1080)),
+    ({'width': 720, 'height': 480, 'sample_aspect_ratio': '0:1'}, (720, 480)),
+])
+def test_display_size(video, expected):
+    assert thumbnails.display_size(video) == expected
+
+
+def test_sprite_grid_follows_the_displayed_frame(monkeypatch, tmp_path):
+    monkeypatch.setattr(workspace, 'WORKSPACE_ROOT', str(tmp_path))
+    ffmpeg_args, uploads = [], {}
+
+    def download_file(self, key):
+        path = os.path.join(self.scratch_dir, 'in.mp4')
+        open(path, 'wb').close()
+        return path
+
+    def probe(self, key, local_path=None):
+        # A phone clip stored landscape, displayed portrait
+        return {'format': {'duration': '25.0'},
+                'streams': [{'codec_type': 'video', 'width': 1920, 'height': 1080,
+                             'side_data_list': [{'rotation': -90}]}]}
+
+    def run_ffmpeg(self, args, **kwargs):
+        ffmpeg_args.append(args)
+        pattern = args[-1]
+        for n in range(1, 5):  # 25 frames at 4x2 tiles per sheet
+            open(pattern.replace('%03d', f'{n:03d}'), 'wb').close()
+
+    def upload_file(self, local_path, dest_key):
+        with open(local_path) as f:
+            uploads[dest_key] = f.read()
+        return dest_key
+
+    monkeypatch.setattr(Thumbnails, 'download_file', download_file)
+    monkeypatch.setattr(Thumbnails, 'probe', probe)
+    monkeypatch.setattr(Thumbnails, 'run_ffmpeg', run_ffmpeg)
+    monkeypatch.setattr(Thumbnails, 'upload_file', upload_file)
+
+    action = Thumbnails.__new__(Thumbnails)
+    receipt = action.execute_action('me', 'media/clip.mp4', 'thumbs', 'jpg', 1,
+                                    sprite_columns=4, sprite_rows=2, sprite_width=160)
+    assert receipt.success, receipt.error_message
+    assert receipt.outputs['thumbnails_created'].ival == 25
+    assert 'fps=1,scale=160:284,setsar=1,tile=4x2' in ffmpeg_args[0]
+
+    assert sorted(uploads) == ['thumbs/sprite_001.jpg', 'thumbs/sprite_002.jpg', 'thumbs/sprite_003.jpg',
+                               'thumbs/sprite_004.jpg', 'thumbs/thumbnails.json', 'thumbs/thumbnails.vtt']
+    index = json.loads(uploads['thumbs/thumbnails.json'])
+    assert (index['width'], index['height'], len(index['frames'])) == (160, 284, 25)
+    assert index['frames'][13] == {'t': 13.0, 'sheet': 1, 'x': 160, 'y': 284}
+    assert index['frames'][24] == {'t': 24.0, 'sheet': 3, 'x': 0, 'y': 0}
+    vtt = uploads['thumbs/thumbnails.vtt'].split('\n')
+    assert vtt[-3:] == ['00:00:24.000 --> 00:00:25.000', 'sprite_004.jpg#xywh=0,0,160,284', '']
@@ -0,0 +1,81 @@
+"""Reuse of saved peaks by src.actions.vendor.ffmpeg.waveform."""
+import shutil
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("PIL")
+pytest.importorskip("feaas.objects")
+waveform = pytest.importorskip("src.actions.vendor.ffmpeg.waveform")
+
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    """An in-memory blob store behind Waveform's download/upload/etag, counting decodes."""
+    blobs, etags, decodes = {}, {'song.wav': 'v1'}, []
+    scratch = tmp_path / 'scratch'
+    scratch.mkdir()
+
+    def download_file(self, key):
+        if key not in blobs:
+            raise waveform.BlobNotFoundError(key)
+        path = tmp_path / key.replace('/', '_')
+        path.write_bytes(blobs[key])
+        return str(path)
+
+    def upload_file(self, path, key):
+        with open(path, 'rb') as f:
+            blobs[key] = f.read()
+        return key
+
+    def pcm(self, key, sample_rate, channels=1):
+        decodes.append(key)
+        return np.sin(np.linspace(0, 200, 44100 * 2, dtype=np.float32))[:, None]
+
+    monkeypatch.setattr(waveform.Waveform, 'download_file', download_file)
+    monkeypatch.setattr(waveform.Waveform, 'upload_file', upload_file)
+    monkeypatch.setattr(waveform.Waveform, 'etag', lambda self, key: etags.get(key))
+    monkeypatch.setattr(waveform.Waveform, 'pcm', pcm)
+    monkeypatch.setattr(waveform.Waveform, 'scratch_dir', str(scratch), raising=False)
+    yield blobs, etags, decodes
+    shutil.rmtree(scratch, ignore_errors=True)
+
+
+def render(**kwargs):
+    action = waveform.Waveform.__new__(waveform.Waveform)
+    receipt = action.execute_action('song.wav', 400, 100, **kwargs)
+    assert receipt.success, receipt.error_message
+    return receipt
+
+
+def test_peaks_are_reused_while_the_source_is_unchanged(store):
+    blobs, _, decodes = store
+    render()
+    assert blobs['song_peaks.etag'] == b'v1'
+    render()
+    assert decodes == ['song.wav']
+
+
+def test_replaced_source_is_decoded_again(store):
+    blobs, etags, decodes = store
+    render()
+    etags['song.wav'] = 'v2'
+    render()
+    assert decodes == ['song.wav', 'song.wav']
+    assert blobs['song_peaks.etag'] == b'v2'
+
+
+def test_peaks_without_a_recorded_etag_are_not_reused(store):
+    blobs, _, decodes = store
+    render()
+    del blobs['song_peaks.etag']
+    render()
+    assert len(decodes) == 2
+
+
+def test_unknown_etag_never_reuses(store):
+    _, etags, decodes = store
+    etags.clear()
+    render()
+    render()
+    assert len(decodes) == 2
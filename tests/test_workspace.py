@@ -0,0 +1,54 @@
+"""Scratch workspaces and orphan sweeping (src.actions.vendor.ffmpeg.workspace)."""
+import os
+
+import pytest
+
+from src.actions.vendor.ffmpeg import workspace
+
+
+@pytest.fixture(autouse=True)
+def root(monkeypatch, tmp_path):
+    monkeypatch.setattr(workspace, 'WORKSPACE_ROOT', str(tmp_path))
+    return tmp_path
+
+
+def make(root, name):
+    path = root / f"{workspace.WORKSPACE_PREFIX}{name}"
+    path.mkdir()
+    return path
+
+
+def test_workspace_is_removed_on_exit(root):
+    with workspace.workspace() as path:
+        assert os.path.isdir(path) and workspace.current() == path
+        workspace.state()['x'] = 1
+    assert not os.path.exists(path)
+    assert workspace.current() is None
+
+
+def test_own_workspace_survives_the_sweep(root):
+    with workspace.workspace() as path:
+        assert workspace.sweep_orphans() == 0
+        assert os.path.isdir(path)
+
+
+def test_earlier_run_with_the_same_pid_is_swept(root):
+    stale = make(root, f"{os.getpid()}-0123456789ab-abc123")
+    legacy = make(root, f"{os.getpid()}-abc123")
+    assert workspace.sweep_orphans() == 2
+    assert not stale.exists() and not legacy.exists()
+
+
+def test_dead_pid_is_swept_and_live_pid_kept(root, monkeypatch):
+    monkeypatch.setattr(workspace, '_pid_alive', lambda pid: pid == 4242)
+    dead = make(root, "4241-0123456789ab-abc")
+    live = make(root, "4242-0123456789ab-abc")
+    assert workspace.sweep_orphans() == 1
+    assert not dead.exists() and live.exists()
+
+
+def test_old_workspaces_are_swept_even_if_their_pid_is_alive(root, monkeypatch):
+    monkeypatch.setattr(workspace, '_pid_alive', lambda pid: True)
+    old = make(root, "4242-0123456789ab-abc")
+    os.utime(old, (0, 0))
+    assert workspace.sweep_orphans() == 1